@@ -13,17 +13,92 @@ data_dir.mkdir(exist_ok=True)
 DATABASE_URL = f"sqlite+aiosqlite:///{data_dir}/pons_cache.db"
 
 # Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(DATABASE_URL, echo=os.getenv("DB_ECHO", "true").lower() == "true")
 
 # Create async session factory
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Columns added after a table was first created: (table, column, column DDL)
+COLUMN_MIGRATIONS = [
+    ("pons_cache", "schema_version", "INTEGER NOT NULL DEFAULT 1"),
+    ("pons_cache", "body", "BLOB"),
+    ("pons_cache", "display_word", "VARCHAR"),
+    ("verbformen_cache", "display_word", "VARCHAR"),
+]
+
+def _add_missing_columns(conn):
+    """Add new columns to existing tables, since create_all only creates missing tables."""
+    for table, column, ddl in COLUMN_MIGRATIONS:
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if existing and column not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+def _rebuild_quiz_progress(conn):
+    """quiz_progress was first keyed by date alone; rebuild it keyed by (quiz, date)."""
+    existing = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(quiz_progress)")}
+    if not existing or "quiz" in existing:
+        return
+    conn.exec_driver_sql("ALTER TABLE quiz_progress RENAME TO quiz_progress_v1")
+    # Index names stay with the renamed table and would clash with the new ones
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_quiz_progress_date")
+    SQLModel.metadata.tables["quiz_progress"].create(conn)
+    conn.exec_driver_sql(
+        "INSERT INTO quiz_progress (quiz, date, correct, total, updated_at) "
+        "SELECT 'sentences', date, correct, total, updated_at FROM quiz_progress_v1"
+    )
+    conn.exec_driver_sql("DROP TABLE quiz_progress_v1")
+
+def _enable_incremental_vacuum(conn):
+    """
+    Let space freed by deletes be given back to the filesystem. Only a new file
+    can switch mode cheaply; an existing one needs a full VACUUM, which rewrites
+    the whole file, so that is left to app.scripts.vacuum_db.
+    """
+    if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+        return
+    if conn.exec_driver_sql("PRAGMA page_count").scalar() == 0:
+        conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+    else:
+        print("Database file does not use incremental vacuum, so compaction cannot shrink it: "
+              "stop the app and run `python -m app.scripts.vacuum_db` once")
+
+def _convert_to_incremental_vacuum(conn):
+    conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.exec_driver_sql("VACUUM")
+
 async def init_db():
     """Initialize the database by creating all tables."""
+    async with engine.connect() as conn:
+        # auto_vacuum must be set before the first table is created, outside a transaction
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.run_sync(_enable_incremental_vacuum)
     async with engine.begin() as conn:
+        await conn.run_sync(_rebuild_quiz_progress)
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+
+async def convert_to_incremental_vacuum() -> None:
+    """Switch an existing database file to incremental vacuum. Rewrites the whole file."""
+    async with engine.connect() as conn:
+        # VACUUM cannot run inside a transaction
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.run_sync(_convert_to_incremental_vacuum)
+
+async def incremental_vacuum() -> None:
+    """Truncate the database file by the pages deletes have left free."""
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        # execute() would step the pragma once and free a single page; executescript runs it to completion
+        await raw.driver_connection.executescript("PRAGMA incremental_vacuum;")
+
+async def database_file_size() -> int:
+    """Bytes the database file takes on disk, free pages included."""
+    async with engine.connect() as conn:
+        page_count = (await conn.exec_driver_sql("PRAGMA page_count")).scalar()
+        page_size = (await conn.exec_driver_sql("PRAGMA page_size")).scalar()
+    return page_count * page_size
 
 @asynccontextmanager
 async def get_session():
@@ -1,26 +1,22 @@
-import re
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI, Request, Query
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, Query, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import requests
-import httpx
 import json
 from urllib.parse import quote
-from bs4 import BeautifulSoup
-from openai import OpenAI
-from openai.types.chat import ChatCompletionMessageParam
-import pandas as pd
 from pathlib import Path
-import random
+from typing import Optional
 import time
 
 # Load environment variables from .env file
 load_dotenv()
 
+from .services.encoded_response import EncodedJSON, CompressionMiddleware, json_response, COMPRESS_MIN_SIZE, LOOKUP_MAX_AGE
+
 app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_SIZE)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
 
@@ -29,52 +25,71 @@ from .routes.quiz import quiz_bp
 from .routes.verb_quiz import router as verb_quiz_router
 from .routes.dictionary import router as dictionary_router
 from .routes.noun_quiz import router as noun_quiz_router
+from .routes.batch_lookup import router as batch_lookup_router
+from .routes.suggest import router as suggest_router
+from .routes.sentences import router as sentences_router
+from .routes.admin import router as admin_router
+from .routes.media import router as media_router
 from .database import init_db
-
-# Initialize database
-init_db()
+from .services.lookup_cache import lookup_cache
+from .services.singleflight import singleflight
+from .services.negative_cache import negative_cache
+from .services.parse_pool import parse_pool, PoolSaturated
+from .services.genai_service import genai_service
+from .services.access_stats import access_stats
+from .services.http_client import start_http_client, close_http_client, http_request, upstream_stats, UpstreamUnavailable
+from .services.verbformen_service import verbformen_service
+from .services.media_cache import media_cache
+from .services.suggest_index import suggest_index
+from .services.normalize import normalize_cache_keys
+from .models import PonsCache, VerbformenCache
+from .services.vocabulary import vocabulary_store
+from .services.quiz_sessions import read_page, QUIZ_PAGE_SIZE
+
+@app.on_event("startup")
+async def startup():
+    # Initialize database
+    await init_db()
+    # Re-key rows cached before keys were normalized
+    for model in (PonsCache, VerbformenCache):
+        await normalize_cache_keys(model)
+    await start_http_client()
+    access_stats.start()
+    vocabulary_store.start_watching()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_http_client()
+    await access_stats.stop()
+    await vocabulary_store.stop_watching()
+    parse_pool.stop()
+    await genai_service.stop()
 
 app.include_router(quiz_bp)
 app.include_router(verb_quiz_router)
 app.include_router(dictionary_router)
 app.include_router(noun_quiz_router)
+app.include_router(batch_lookup_router)
+app.include_router(suggest_router)
+app.include_router(sentences_router)
+app.include_router(admin_router)
+app.include_router(media_router)
 
 PONS_API_KEY = os.getenv("PONS_API_KEY")
 
-# Load quiz sentences
-def load_quiz_sentences():
-    try:
-        data_path = Path("resource/learn_vocab.xlsx")
-        if not data_path.exists():
-            return []
-        
-        # Read Excel file with explicit string handling
-        df = pd.read_excel(data_path, sheet_name="Sentences", dtype=str)
-        sentences = []
-        
-        for _, row in df.iterrows():
-            # Convert values to strings and handle NaN/None values
-            german = str(row["German"]).strip() if pd.notna(row["German"]) else ""
-            english = str(row["English"]).strip() if pd.notna(row["English"]) else ""
-            
-            # Ensure proper encoding of umlauts
-            german = german.encode('utf-8').decode('utf-8')
-            english = english.encode('utf-8').decode('utf-8')
-            
-            # Only add sentences where both German and English are non-empty
-            if german and english:
-                sentences.append({
-                    "german": german,
-                    "english": english
-                })
-        
-        return sentences
-    except Exception as e:
-        print(f"Error loading quiz sentences: {e}")
-        return []
+# Store base sentences in memory, plus their pre-encoded JSON body
+BASE_SENTENCES = vocabulary_store.current.quiz_sentences
+BASE_SENTENCES_JSON = EncodedJSON(BASE_SENTENCES)
+
+async def reload_quiz_sentences(vocabulary):
+    encoded = EncodedJSON(vocabulary.quiz_sentences)
+    def commit():
+        global BASE_SENTENCES, BASE_SENTENCES_JSON
+        BASE_SENTENCES = vocabulary.quiz_sentences
+        BASE_SENTENCES_JSON = encoded
+    return commit
 
-# Store base sentences in memory
-BASE_SENTENCES = load_quiz_sentences()
+vocabulary_store.on_reload(reload_quiz_sentences)
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -85,165 +100,50 @@ async def quiz(request: Request):
     return templates.TemplateResponse("quiz.html", {"request": request})
 
 @app.get("/api/quiz/sentences")
-async def get_quiz_sentences():
+async def get_quiz_sentences(request: Request):
+    """
+    Serve all quiz sentences from a pre-encoded body with an ETag, so repeat
+    visits get a 304. The order is fixed; /api/quiz/sentences/page serves a shuffle.
+    """
+    return BASE_SENTENCES_JSON.response(request)
+
+@app.get("/api/quiz/sentences/page")
+async def get_quiz_sentences_page(cursor: Optional[str] = None, size: int = QUIZ_PAGE_SIZE):
+    """Serve the sentence quiz a page at a time from a per-session shuffle."""
     try:
-        # Create a new shuffled copy for each request
-        sentences = BASE_SENTENCES.copy()
-        random.shuffle(sentences)
         return JSONResponse(
-            content=sentences,
+            content=read_page(BASE_SENTENCES, cursor, size),
             media_type="application/json; charset=utf-8"
         )
-    except Exception as e:
-        print(f"Error serving quiz sentences: {e}")
-        return JSONResponse(content=[], status_code=500)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/api/lookup")
-async def lookup(word: str):
-    encoded_word = quote(word)
-    verbformen_url = f"https://www.verbformen.de/?w={encoded_word}"
-    html = requests.get(verbformen_url).text
-
-    # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(html, 'html.parser')
-
-    # Extract grammatical article from Nominativ row
-    article = ""
-    nominativ_row = soup.find("th", title="Nominativ")
-    if nominativ_row:
-        parent_row = nominativ_row.find_parent("tr")
-        if parent_row:
-            cells = parent_row.find_all("td")
-            if len(cells) >= 2:
-                article = cells[0].get_text(strip=True)
-
-    # Find the span with lang="en" tag containing the translation
-    translation_span = soup.find('span', lang='en')
-    
-    translation_text = ""
-    beispiele_list = []
-    verb_conjugations = {
-        "präsens": [],
-        "präteritum": [],
-        "imperativ": [],
-        "konjunktiv_i": [],
-        "konjunktiv_ii": [],
-        "infinitiv": [],
-        "partizip": []
-    }
-
-    if translation_span:
-        # Extract the text, removing any HTML tags within the span
-        translation_text = translation_span.get_text(separator=", ")
-        translation_text = translation_text.strip()
-        translation_text = ", ".join(filter(None, translation_text.split(", ")))
-    
-        # Find verb conjugations from tables
-        conjugation_tables = soup.find_all("div", class_="vTbl")
-        for table_div in conjugation_tables:
-            heading = table_div.find("h2", class_="wG")
-            if heading:
-                tense = heading.get_text(strip=True).lower()
-                # Map the tense to our standardized keys
-                tense_key = None
-                if "präsens" in tense:
-                    tense_key = "präsens"
-                elif "präteritum" in tense:
-                    tense_key = "präteritum"
-                elif "partizip" in tense:
-                    tense_key = "partizip"
-                
-                if tense_key:
-                    # Get the table
-                    table = table_div.find("table")
-                    if table:
-                        conjugations = []
-                        rows = table.find_all("tr")
-                        for row in rows:
-                            cells = row.find_all("td")
-                            if len(cells) >= 2:
-                                pronoun = cells[0].get_text(strip=True)
-                                verb = cells[1].get_text(strip=True)
-                                conjugations.append(f"{pronoun} {verb}")
-                            elif len(cells) == 1:
-                                verb = cells[0].get_text(strip=True)
-                                conjugations.append(verb)
-                        
-                        if conjugations:
-                            verb_conjugations[tense_key] = conjugations
-                            print(f"Found {tense_key} conjugations: {conjugations}")  # Debug print
-
-        print(verb_conjugations)
-        heading = soup.find("h2", string="Beispiele")
-
-        if heading:
-            beispiele_section = heading.find_next("ul")
-
-            if beispiele_section:
-                list_items = beispiele_section.find_all("li")
-                for li in list_items:
-                    # Extract only the German text before the <br> tag
-                    german_html = ""
-                    for content in li.contents:
-                        if content.name == 'br':
-                            break
-                        if isinstance(content, str):
-                            german_html += content
-                        else:
-                            german_html += str(content)
-                    german_text = german_html.strip()
-
-                    # Extract the English translation from the img title or the span after <br>
-                    translation_span = li.find("br")
-                    english_translation = ""
-                    if translation_span and translation_span.next_sibling:
-                        following_span = translation_span.find_next("span")
-                        if following_span:
-                            english_translation = following_span.get_text(strip=True)
-
-                    beispiele_list.append({
-                        "de": german_text,
-                        "en": english_translation
-                    })
-
-            else:
-                print("No <ul> with examples found.")
-        else:
-            print("No 'Beispiele' section found.")
-        
-    
-    # Simple image URL logic based on known pattern
-    base_image_url = f"https://www.verbformen.de/deklination/substantive/{encoded_word}.png"
-
-    # Try to find the actual image URL in the HTML using the requested pattern
-    match = re.search(r'https://www\.verbformen\.de/deklination/substantive/[^"]+\.png', html)
-    dynamic_image_url = match.group(0) if match else base_image_url
-
-    # Verify if the image exists
+async def lookup(request: Request, word: str):
     try:
-        response = requests.head(dynamic_image_url)
-        if response.status_code != 200:
-            dynamic_image_url = None
-            print(f"Image not found at URL: {dynamic_image_url}")
-    except Exception as e:
-        dynamic_image_url = None
-        print(f"Error checking image URL: {e}")
-
-    # Search for MP3 sound URL - look for any MP3 file containing the word
-    sound_match = re.search(f'https://www\.verbformen\.de/deklination/substantive/grundform/[^"]+\.mp3', html)
-    word_sound = sound_match.group(0) if sound_match else None
-    print(word_sound)
-    return JSONResponse(content={
-        "word": encoded_word,
-        "pons": {},
-        "verbformen_html": f'<a href="{verbformen_url}">{verbformen_url}</a>',
-        "verb_image_url": dynamic_image_url,
-        "translation": translation_text,
-        "beispiele_list": beispiele_list,
-        "article": article,
-        "word_sound": word_sound,
-        "verb_conjugations": verb_conjugations
-    })
+        # A single interactive lookup is answered 503 when the parser is busy rather than queued
+        payload, _ = await verbformen_service.get_payload(word, wait_for_parser=False)
+    except UpstreamUnavailable as e:
+        # Nothing cached to fall back on: fail fast rather than hang
+        return JSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "30"})
+    except PoolSaturated as e:
+        return JSONResponse(content={"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
+    if not payload.get("translation"):
+        payload = {**payload, "did_you_mean": suggest_index.did_you_mean(word)}
+    return json_response(request, payload, LOOKUP_MAX_AGE)
+
+@app.get("/api/lookup/cache/stats")
+async def lookup_cache_stats():
+    return {
+        **lookup_cache.stats(),
+        "negative": negative_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "upstreams": upstream_stats(),
+        "parse_pool": parse_pool.stats(),
+        "genai": genai_service.stats(),
+        "media": media_cache.stats(),
+        "access_stats": access_stats.stats()
+    }
 
 @app.get("/api/dict/pons")
 async def lookup(word: str):
@@ -256,8 +156,7 @@ async def lookup(word: str):
         "X-Secret": PONS_API_KEY  # API key for authentication
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(pons_url, headers=headers)
+    response = await http_request("GET", pons_url, headers=headers)
 
     if response.status_code == 200:
         data = response.json()
@@ -296,32 +195,32 @@ async def lookup(word: str):
         return JSONResponse(content={"error": "Failed to fetch data from PONS API"}, status_code=500)
     
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-@app.get("/api/genai/examples")
 @app.get("/api/genai/examples")
-async def generate_examples(word: str):
-    prompt = (
-        f"Give me 5 short daily-use example sentences in German using the word '{word}'. "
-        "Each sentence should be followed by its English translation. "
-        "Return the result as a JSON array like: "
-        "[{\"de\": \"German sentence\", \"en\": \"English translation\"}]"
-    )
-
+async def generate_examples(word: str, stream: bool = False):
+    """
+    Generate example sentences for a word, served from the cache when possible.
+
+    Args:
+        word (str): The word to use in the examples
+        stream (bool): Send each example as a server-sent event as soon as it is generated
+
+    Returns:
+        dict: {"examples": [{"de", "en"}], "cached": bool}, or a text/event-stream
+    """
+    if stream:
+        return StreamingResponse(stream_examples_events(word), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
-
-        # Extract and parse content
-        content = response.choices[0].message.content
-        import json
-        examples = json.loads(content)
-
-        return {"examples": examples}
+        examples, is_cached = await genai_service.get_examples(word)
+        return {"examples": examples, "cached": is_cached}
+    except Exception as e:
+        return {"error": str(e)}
 
+async def stream_examples_events(word: str):
+    try:
+        is_cached, examples = await genai_service.stream_examples(word)
+        async for example in examples:
+            yield f"data: {json.dumps(example, ensure_ascii=False)}\n\n"
+        yield f"event: done\ndata: {json.dumps({'cached': is_cached})}\n\n"
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
\ No newline at end of file
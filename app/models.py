@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, LargeBinary, UniqueConstraint
 from pydantic import BaseModel
 
 class PonsCache(SQLModel, table=True):
@@ -8,12 +9,85 @@ class PonsCache(SQLModel, table=True):
     
     id: Optional[int] = Field(default=None, primary_key=True)
     word: str = Field(unique=True, index=True)
-    result: str
+    # The word as it was searched (Mädchen), since `word` holds the normalized key
+    display_word: Optional[str] = None
+    result: str = ""
+    # zlib-compressed serialized result (schema_version 3)
+    body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    search_count: int = Field(default=1)
+    last_accessed: datetime = Field(default_factory=datetime.utcnow)
+    # 1 = raw PONS API body, 2 = serialized {"translations": [...]} as served, 3 = serialized and compressed in body
+    schema_version: int = Field(default=1)
+
+class VerbformenCache(SQLModel, table=True):
+    __tablename__ = "verbformen_cache"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    word: str = Field(unique=True, index=True)
+    # The word as it was searched (Mädchen), since `word` holds the normalized key
+    display_word: Optional[str] = None
+    payload: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
     search_count: int = Field(default=1)
     last_accessed: datetime = Field(default_factory=datetime.utcnow)
 
+class QuizProgress(SQLModel, table=True):
+    __tablename__ = "quiz_progress"
+    __table_args__ = (UniqueConstraint("quiz", "date", name="uq_quiz_progress_quiz_date"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    quiz: str = Field(default="sentences")
+    # ISO date (YYYY-MM-DD), so string order is date order
+    date: str = Field(index=True)
+    correct: int = Field(default=0)
+    total: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class QuizStats(SQLModel, table=True):
+    """Running aggregates per quiz, updated on every progress write."""
+    __tablename__ = "quiz_stats"
+
+    quiz: str = Field(primary_key=True)
+    days_played: int = Field(default=0)
+    total_correct: int = Field(default=0)
+    total_answered: int = Field(default=0)
+    current_streak: int = Field(default=0)
+    longest_streak: int = Field(default=0)
+    # Most recent date with at least one answer
+    last_played: Optional[str] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class GenaiExamples(SQLModel, table=True):
+    """Generated example sentences per word and prompt version."""
+    __tablename__ = "genai_examples"
+    __table_args__ = (UniqueConstraint("word", "prompt_version", name="uq_genai_examples_word_prompt"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    word: str = Field(index=True)
+    prompt_version: int
+    # JSON array of {"de", "en"}
+    examples: str
+    model: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class MediaAsset(SQLModel, table=True):
+    """An upstream image or sound file, stored on disk under its content hash."""
+    __tablename__ = "media_assets"
+
+    url: str = Field(primary_key=True)
+    # sha256 of the body plus extension, or None if upstream had no such file
+    file_name: Optional[str] = None
+    size: int = Field(default=0)
+    fetched_at: datetime = Field(default_factory=datetime.utcnow)
+
 class PonsResponse(BaseModel):
     word: str
     result: str
-    is_cached: bool = False 
\ No newline at end of file
+    is_cached: bool = False
+
+class BatchLookupRequest(BaseModel):
+    words: List[str]
+    # Any of "verbformen" (the /api/lookup payload) and "pons"
+    sources: List[str] = ["verbformen"]
+    concurrency: Optional[int] = None
@@ -0,0 +1,31 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from app.services.vocabulary import vocabulary_store
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+def check_admin_token(token: Optional[str]):
+    # Admin endpoints are closed until ADMIN_TOKEN is configured
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled: ADMIN_TOKEN is not set")
+    if token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/vocabulary")
+async def vocabulary_status(x_admin_token: Optional[str] = Header(None)):
+    check_admin_token(x_admin_token)
+    return vocabulary_store.stats()
+
+@router.post("/vocabulary/reload")
+async def reload_vocabulary(x_admin_token: Optional[str] = Header(None)):
+    """
+    Re-read learn_vocab.xlsx and rebuild every derived index, swapping them in
+    atomically. On failure the current data keeps being served.
+    """
+    check_admin_token(x_admin_token)
+    if not await vocabulary_store.reload():
+        raise HTTPException(status_code=500, detail=f"Reload failed: {vocabulary_store.last_error}")
+    return {"success": True, **vocabulary_store.stats()}
@@ -0,0 +1,86 @@
+import os
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.models import BatchLookupRequest
+from app.routes.dictionary import pons_service
+from app.services.verbformen_service import verbformen_service
+
+router = APIRouter()
+
+BATCH_LOOKUP_CONCURRENCY = int(os.getenv("BATCH_LOOKUP_CONCURRENCY", "8"))
+BATCH_LOOKUP_MAX_CONCURRENCY = int(os.getenv("BATCH_LOOKUP_MAX_CONCURRENCY", "32"))
+BATCH_LOOKUP_MAX_WORDS = int(os.getenv("BATCH_LOOKUP_MAX_WORDS", "1000"))
+BATCH_LOOKUP_SOURCES = ("verbformen", "pons")
+
+async def lookup_one(word: str, source: str, upstream_limit: asyncio.Semaphore) -> dict:
+    """Resolve one word from cache, or upstream while holding a concurrency slot."""
+    try:
+        if source == "verbformen":
+            cached_payload = await verbformen_service.get_cached_payload(word)
+            if cached_payload:
+                return {"word": word, "source": source, "cached": True, "result": cached_payload}
+            async with upstream_limit:
+                payload, is_cached = await verbformen_service.fetch_or_stale(word)
+            return {"word": word, "source": source, "cached": is_cached, "result": payload}
+
+        cached_response = await pons_service.get_cached_definition(word)
+        if not cached_response:
+            async with upstream_limit:
+                cached_response = await pons_service.fetch_definition(word)
+        return {
+            "word": word,
+            "source": source,
+            "cached": cached_response.is_cached,
+            "result": json.loads(cached_response.result)
+        }
+    except Exception as e:
+        print(f"Error in batch lookup for {word} ({source}): {e}")
+        return {"word": word, "source": source, "error": str(e)}
+
+async def stream_results(words, sources, concurrency: int):
+    """Yield one NDJSON line per (word, source) in completion order."""
+    upstream_limit = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.ensure_future(lookup_one(word, source, upstream_limit))
+        for word in words
+        for source in sources
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    finally:
+        # Stop outstanding lookups if the client goes away mid-stream
+        for task in tasks:
+            task.cancel()
+
+@router.post("/api/lookup/batch")
+async def batch_lookup(request: BatchLookupRequest):
+    """
+    Look up many words at once and stream results as NDJSON.
+
+    Cache hits are answered immediately; misses go upstream with at most
+    `concurrency` requests in flight. Each line is
+    {"word", "source", "cached", "result"} or {"word", "source", "error"}.
+    """
+    # Drop blanks and duplicates while keeping the caller's order
+    words = list(dict.fromkeys(word.strip() for word in request.words if word.strip()))
+    if not words:
+        raise HTTPException(status_code=400, detail="At least one word is required")
+    if len(words) > BATCH_LOOKUP_MAX_WORDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_LOOKUP_MAX_WORDS} words per batch")
+
+    sources = list(dict.fromkeys(request.sources))
+    unknown = [source for source in sources if source not in BATCH_LOOKUP_SOURCES]
+    if not sources or unknown:
+        raise HTTPException(status_code=400, detail=f"Sources must be any of {list(BATCH_LOOKUP_SOURCES)}")
+
+    concurrency = request.concurrency or BATCH_LOOKUP_CONCURRENCY
+    concurrency = max(1, min(concurrency, BATCH_LOOKUP_MAX_CONCURRENCY))
+
+    return StreamingResponse(
+        stream_results(words, sources, concurrency),
+        media_type="application/x-ndjson"
+    )
@@ -5,6 +5,22 @@ from app.models import PonsResponse
 router = APIRouter()
 pons_service = PonsService()
 
+@router.on_event("startup")
+async def migrate_pons_cache():
+    """Convert cache rows written by older versions to the current format, then start compaction."""
+    migrated = await pons_service.migrate_cache()
+    if migrated:
+        print(f"Migrated {migrated} PONS cache entries")
+    pons_service.start_compaction()
+
+@router.on_event("shutdown")
+async def stop_pons_service():
+    await pons_service.stop()
+
+@router.get("/api/dict/pons/cache/stats")
+async def pons_cache_stats():
+    return await pons_service.stats()
+
 @router.get("/api/dict/pons", response_model=PonsResponse)
 async def get_word_definition(word: str):
     """
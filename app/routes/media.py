@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from app.services.media_cache import media_cache, MEDIA_MAX_AGE, MEDIA_ROUTE
+
+router = APIRouter()
+
+@router.on_event("startup")
+async def load_media_cache():
+    await media_cache.load()
+
+@router.on_event("shutdown")
+async def stop_media_cache():
+    await media_cache.stop()
+
+@router.get(MEDIA_ROUTE + "/stats")
+async def media_cache_stats():
+    return media_cache.stats()
+
+@router.get(MEDIA_ROUTE + "/{file_name}")
+async def get_media(request: Request, file_name: str):
+    """
+    Serve a cached image or sound file.
+
+    Args:
+        file_name (str): Content hash of the file plus its extension
+
+    Returns:
+        FileResponse: The file, cacheable for MEDIA_MAX_AGE since its name changes with its content
+    """
+    path = media_cache.path_for(file_name)
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="Media file not found")
+
+    headers = {
+        "ETag": f'"{file_name.split(".")[0]}"',
+        "Cache-Control": f"public, max-age={MEDIA_MAX_AGE}, immutable"
+    }
+    if headers["ETag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
@@ -1,72 +1,77 @@
-import os
-import json
-from datetime import datetime
+from datetime import date
+from typing import Optional
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from pathlib import Path
+from app.services.progress_store import progress_store, DEFAULT_QUIZ
 
 quiz_bp = APIRouter(prefix="/api/quiz", tags=["quiz"])
 
-def get_progress_file_path():
-    # Use environment variable for Docker volume path, fallback to local path
-    base_path = os.getenv('QUIZ_DATA_PATH', os.path.join(os.path.dirname(__file__), '..', 'data'))
-    return os.path.join(base_path, 'quiz_progress.json')
-
-def ensure_progress_file():
-    progress_file = get_progress_file_path()
+def parse_date(value: Optional[str], name: str) -> Optional[str]:
+    """Validate an ISO date (YYYY-MM-DD) and return it in canonical form."""
+    if value is None:
+        return None
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(progress_file), exist_ok=True)
-        
-        # Create file with empty JSON object if it doesn't exist
-        if not os.path.exists(progress_file):
-            with open(progress_file, 'w') as f:
-                json.dump({}, f)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error ensuring progress file: {str(e)}")
-
-def load_progress():
-    progress_file = get_progress_file_path()
-    try:
-        ensure_progress_file()
-        with open(progress_file, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return {}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading progress: {str(e)}")
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid {name} date: {value}")
 
-def save_progress(progress):
-    progress_file = get_progress_file_path()
+@quiz_bp.on_event("startup")
+async def migrate_progress_file():
+    """Move progress from the old quiz_progress.json into the database."""
     try:
-        ensure_progress_file()
-        with open(progress_file, 'w') as f:
-            json.dump(progress, f, indent=2)
+        imported = await progress_store.migrate_json()
+        if imported:
+            print(f"Migrated {imported} days of quiz progress")
+        await progress_store.ensure_stats()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error saving progress: {str(e)}")
+        print(f"Error migrating quiz progress: {e}")
 
 @quiz_bp.get("/progress")
-async def get_progress():
-    try:
-        progress = load_progress()
-        return progress
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_progress(start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+                       quiz: str = DEFAULT_QUIZ):
+    """
+    Get daily quiz results.
+
+    Args:
+        quiz (str): Quiz type, defaults to the sentence quiz
+        start (str): First date to include (YYYY-MM-DD), optional
+        end (str): Last date to include (YYYY-MM-DD), optional
+        limit (int): Only return the most recent N days in the range, optional
+
+    Returns:
+        dict: {date: {"correct", "total"}} ordered by date
+    """
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    return await progress_store.get_range(parse_date(start, "start"), parse_date(end, "end"), limit, quiz)
+
+@quiz_bp.get("/progress/stats")
+async def get_progress_stats(quiz: Optional[str] = None, today: Optional[str] = None):
+    """
+    Get streaks, totals and 7/30-day rolling accuracy, maintained on every progress write.
+
+    Args:
+        quiz (str): Only this quiz type, optional
+        today (str): The client's current date (YYYY-MM-DD), defaults to today in UTC
+
+    Returns:
+        dict: {quiz: {days_played, total_correct, total_answered, accuracy,
+               current_streak, longest_streak, last_played, rolling}}
+    """
+    return await progress_store.get_stats(quiz, parse_date(today, "today"))
 
 @quiz_bp.post("/progress")
 async def update_progress(data: dict):
     if not data or 'date' not in data or 'correct' not in data or 'total' not in data:
         raise HTTPException(status_code=400, detail="Invalid data")
 
+    progress_date = parse_date(data['date'], "progress")
     try:
-        progress = load_progress()
-        progress[data['date']] = {
-            'correct': data['correct'],
-            'total': data['total']
-        }
-        save_progress(progress)
+        correct, total = int(data['correct']), int(data['total'])
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid data")
+
+    try:
+        await progress_store.upsert(progress_date, correct, total, str(data.get('quiz') or DEFAULT_QUIZ))
         return {"success": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-# ... existing code ... 
\ No newline at end of file
@@ -0,0 +1,51 @@
+import json
+from fastapi import APIRouter, HTTPException
+from sqlmodel import select
+from app.database import get_session
+from app.models import VerbformenCache
+from app.services.sentence_index import SentenceIndex, sentence_index
+from app.services.vocabulary import vocabulary_store
+
+router = APIRouter()
+
+MAX_PAGE_SIZE = 100
+
+async def prepare_sentence_index(vocabulary):
+    """Index the Sentences sheet and every Beispiele list already in the lookup cache."""
+    new_index = SentenceIndex()
+    new_index.add_sheet_sentences(vocabulary.sentences)
+    async with get_session() as session:
+        result = await session.execute(select(VerbformenCache.payload))
+        for payload in result.scalars():
+            new_index.add_examples(json.loads(payload).get("beispiele_list", []))
+
+    def commit():
+        sentence_index.swap_from(new_index)
+        print(f"Sentence index built with {len(sentence_index)} sentences")
+    return commit
+
+vocabulary_store.on_reload(prepare_sentence_index)
+
+@router.on_event("startup")
+async def build_sentence_index():
+    commit = await prepare_sentence_index(vocabulary_store.current)
+    commit()
+
+@router.get("/api/sentences/search")
+async def search_sentences(q: str, page: int = 1, page_size: int = 20):
+    """
+    Search example sentences in German and English.
+
+    Args:
+        q (str): Words that must all appear; wrap a phrase in double quotes
+        page (int): 1-based page number
+        page_size (int): Results per page
+
+    Returns:
+        dict: The total number of matches and one page of sentences
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query parameter q is required")
+    page = max(1, page)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    return sentence_index.search(q, page, page_size)
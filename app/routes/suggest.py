@@ -0,0 +1,57 @@
+from fastapi import APIRouter
+from app.services.suggest_index import SuggestIndex, suggest_index, load_cached_words, SUGGEST_TOP_N
+from app.services.vocabulary import vocabulary_store
+
+router = APIRouter()
+
+MAX_SUGGESTIONS = SUGGEST_TOP_N
+
+async def prepare_suggest_index(vocabulary):
+    """Index vocabulary headwords plus every word already in the lookup caches."""
+    entries = [(noun["singular"], 0) for noun in vocabulary.nouns]
+    entries.extend((verb["infinitive"], 0) for verb in vocabulary.verbs)
+    entries.extend(await load_cached_words())
+    new_index = SuggestIndex()
+    new_index.bulk_load(entries)
+
+    def commit():
+        suggest_index.swap_from(new_index)
+        print(f"Suggest index built with {len(suggest_index)} words")
+    return commit
+
+vocabulary_store.on_reload(prepare_suggest_index)
+
+@router.on_event("startup")
+async def build_suggest_index():
+    commit = await prepare_suggest_index(vocabulary_store.current)
+    commit()
+
+@router.get("/api/suggest")
+async def suggest(q: str, limit: int = 10):
+    """
+    Type-ahead completions for a prefix, ranked by how often each word was searched.
+
+    Args:
+        q (str): The prefix typed so far
+        limit (int): Maximum number of suggestions
+
+    Returns:
+        dict: The query and a list of {"word", "count"} suggestions
+    """
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    return {"query": q, "suggestions": suggest_index.suggest(q, limit)}
+
+@router.get("/api/spell")
+async def spell(q: str, limit: int = 5):
+    """
+    "Did you mean" candidates within two edits of a word, umlaut and ß spellings folded.
+
+    Args:
+        q (str): The word as typed
+        limit (int): Maximum number of candidates
+
+    Returns:
+        dict: Whether the word is known and a list of {"word", "distance", "count"} candidates
+    """
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    return {"query": q, "known": q in suggest_index, "suggestions": suggest_index.did_you_mean(q, limit)}
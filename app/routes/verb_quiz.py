@@ -1,134 +1,103 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-import pandas as pd
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+from app.services.vocabulary import vocabulary_store
 import random
+import re
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 
-def find_verb_form_in_sentence(sentence, verb_forms):
-    """Find which verb form appears in the sentence and return it along with the sentence with the blank."""
-    # Check both German and German example 2 columns
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def get_verb_forms(verb):
+    return [
+        verb["infinitive"],
+        verb["perfect"],
+        verb["ich"],
+        verb["du"],
+        verb["er"],
+        verb["sie"],
+        verb["es"],
+        verb["wir_sie"],
+        verb["ihr"]
+    ]
+
+def get_german_texts(sentence):
+    """German and German example 2 columns, lower-cased, in that order."""
     german_texts = []
     if "German" in sentence and sentence["German"]:
         german_texts.append(sentence["German"].lower())
     if "German example 2" in sentence and sentence["German example 2"]:
         german_texts.append(sentence["German example 2"].lower())
-    
-    # Sort verb forms by length (longest first) to match longer forms before shorter ones
-    sorted_forms = sorted([f for f in verb_forms if f], key=len, reverse=True)
-    
-    # Try each verb form
-    for form in sorted_forms:
-        form_lower = form.lower()
-        
-        # Check each German text
-        for german_text in german_texts:
-            if form_lower in german_text:
-                # Create the blanked sentence by replacing the form with ____
-                blanked_sentence = german_text.replace(form_lower, "____")
-                return {
-                    "form": form,
-                    "blanked_sentence": blanked_sentence,
-                    "original_sentence": german_text
-                }
-    
-    return None
+    return german_texts
 
-def find_matching_sentences(verb_forms, sentences):
-    """Find all sentences that contain any of the verb forms."""
-    matching_sentences = []
-    print(f"\nVerb forms to search: {[f for f in verb_forms if f]}")
-    
+def build_token_index(sentences):
+    """Map each lower-cased word to the (sentence index, text index) pairs it appears in."""
+    token_index = {}
     for i, sentence in enumerate(sentences):
-        blank_info = find_verb_form_in_sentence(sentence, verb_forms)
-        if blank_info:
-            matching_sentences.append({
-                "sentence": sentence,
-                "blank_info": blank_info,
-                "sentence_index": i
-            })
-    
-    print(f"Found {len(matching_sentences)} matching sentences")
-    return matching_sentences
+        for j, german_text in enumerate(get_german_texts(sentence)):
+            for token in WORD_PATTERN.findall(german_text):
+                token_index.setdefault(token, set()).add((i, j))
+    return token_index
 
-def load_verb_data():
-    try:
-        data_path = Path("resource/learn_vocab.xlsx")
-        if not data_path.exists():
-            print(f"Excel file not found at: {data_path.absolute()}")
-            return [], []
-        
-        # Read Verb sheet (title in row 1, data in row 2)
-        print("Reading Verb sheet...")
-        verbs_df = pd.read_excel(data_path, sheet_name="Verb", skiprows=1)
-        print(f"Verb sheet columns: {verbs_df.columns.tolist()}")
-        
-        verbs = []
-        for _, row in verbs_df.iterrows():
-            try:
-                # Check if PP form is "Verb not found"
-                pp_value = str(row.get("PP", "")).strip()
-                has_perfect_form = pp_value and pp_value.lower() != "verb not found"
-                
-                verb = {
-                    "meaning": str(row.get("Meaning", "")).strip() if pd.notna(row.get("Meaning")) else "",
-                    "infinitive": str(row.get("Infinity", "")).strip() if pd.notna(row.get("Infinity")) else "",
-                    "perfect": pp_value if has_perfect_form else "",
-                    "ich": str(row.get("ich", "")).strip() if pd.notna(row.get("ich")) else "",
-                    "du": str(row.get("du", "")).strip() if pd.notna(row.get("du")) else "",
-                    "er": str(row.get("er", "")).strip() if pd.notna(row.get("er")) else "",
-                    "sie": str(row.get("sie", "")).strip() if pd.notna(row.get("sie")) else "",
-                    "es": str(row.get("es", "")).strip() if pd.notna(row.get("es")) else "",
-                    "wir_sie": str(row.get("wir/Sie", "")).strip() if pd.notna(row.get("wir/Sie")) else "",
-                    "ihr": str(row.get("ihr", "")).strip() if pd.notna(row.get("ihr")) else ""
-                }
-                # Only add verbs that have at least a meaning and infinitive form
-                if verb["meaning"] and verb["infinitive"]:
-                    verbs.append(verb)
-            except Exception as e:
-                print(f"Error processing verb row: {e}")
+def blank_form(text, form_lower):
+    """Replace whole-word occurrences of the form with ____ (so "er" never matches inside "wieder")."""
+    pattern = re.compile(r"(?<!\w)" + re.escape(form_lower) + r"(?!\w)")
+    return pattern.sub("____", text) if pattern.search(text) else None
+
+def find_matching_sentences(verb_forms, sentences, token_index):
+    """Find all sentences containing any of the verb forms as whole words, longest form first."""
+    sorted_forms = sorted([f.strip() for f in verb_forms if f and f.strip()], key=len, reverse=True)
+    matches = {}
+    for form in sorted_forms:
+        form_lower = form.lower()
+        tokens = WORD_PATTERN.findall(form_lower)
+        if not tokens:
+            continue
+        # Only sentences containing every word of the form can match it
+        candidates = set.intersection(*(token_index.get(token, set()) for token in tokens))
+        for i, j in sorted(candidates, key=lambda candidate: candidate[1]):
+            if i in matches:
                 continue
-        
-        # Read Sentences sheet (title in row 1, data in row 1)
-        print("Reading Sentences sheet...")
-        sentences_df = pd.read_excel(data_path, sheet_name="Sentences")
-        print(f"Sentences sheet columns: {sentences_df.columns.tolist()}")
-        # print(f"First row of Sentences sheet: {sentences_df.iloc[0].to_dict()}")
-        
-        sentences = []
-        for _, row in sentences_df.iterrows():
-            try:
-                sentence = {
-                    "English": str(row.get("English", "")).strip() if pd.notna(row.get("English")) else "",
-                    "German": str(row.get("German", "")).strip() if pd.notna(row.get("German")) else "",
-                    "German example 2": str(row.get("German example 2", "")).strip() if pd.notna(row.get("German example 2")) else ""
+            german_text = get_german_texts(sentences[i])[j]
+            blanked_sentence = blank_form(german_text, form_lower)
+            if blanked_sentence:
+                matches[i] = {
+                    "sentence": sentences[i],
+                    "blank_info": {
+                        "form": form,
+                        "blanked_sentence": blanked_sentence,
+                        "original_sentence": german_text
+                    },
+                    "sentence_index": i
                 }
-                # Only add sentences that have at least one German text
-                if sentence["German"] or sentence["German example 2"]:
-                    sentences.append(sentence)
-            except Exception as e:
-                print(f"Error processing sentence row: {e}")
-                continue
-        
-        print(f"Loaded {len(verbs)} verbs and {len(sentences)} sentences")
-        # print("First few sentences:")
-        # for i, sentence in enumerate(sentences[:3]):
-        #     print(f"Sentence {i}:")
-        #     print(f"  English: {sentence['English']}")
-        #     print(f"  German: {sentence['German']}")
-        #     print(f"  German example 2: {sentence['German example 2']}")
-        return verbs, sentences
-    except Exception as e:
-        print(f"Error loading verb data: {e}")
-        import traceback
-        traceback.print_exc()
-        return [], []
+    return [matches[i] for i in sorted(matches)]
+
+def build_verb_sentence_index(verbs, sentences):
+    """Precompute the matching sentences of every verb, keeping only verbs that have some."""
+    token_index = build_token_index(sentences)
+    playable = []
+    for verb in verbs:
+        matching_sentences = find_matching_sentences(get_verb_forms(verb), sentences, token_index)
+        if matching_sentences:
+            playable.append((verb, matching_sentences))
+    print(f"{len(playable)} of {len(verbs)} verbs have matching sentences")
+    return playable
 
-# Store data in memory
-VERBS, SENTENCES = load_verb_data()
+# Verb and Sentences sheets are parsed once by the shared vocabulary loader
+VERBS, SENTENCES = vocabulary_store.current.verbs, vocabulary_store.current.sentences
+VERB_SENTENCES = build_verb_sentence_index(VERBS, SENTENCES)
+
+async def reload_verbs(vocabulary):
+    verb_sentences = await run_in_threadpool(build_verb_sentence_index, vocabulary.verbs, vocabulary.sentences)
+    def commit():
+        global VERBS, SENTENCES, VERB_SENTENCES
+        VERBS, SENTENCES, VERB_SENTENCES = vocabulary.verbs, vocabulary.sentences, verb_sentences
+    return commit
+
+vocabulary_store.on_reload(reload_verbs)
 
 @router.get("/verb-quiz", response_class=HTMLResponse)
 async def verb_quiz(request: Request):
@@ -139,29 +108,10 @@ async def get_next_verb():
     if not VERBS:
         return {"error": "No verbs available"}
     
-    # Select a random verb
-    verb = random.choice(VERBS)
-    print(f"\nSelected verb: {verb['meaning']} ({verb['infinitive']})")
-    
-    # Get all verb forms
-    verb_forms = [
-        verb["infinitive"],
-        verb["perfect"],
-        verb["ich"],
-        verb["du"],
-        verb["er"],
-        verb["sie"],
-        verb["es"],
-        verb["wir_sie"],
-        verb["ihr"]
-    ]
-    
-    # Find matching sentences
-    matching_sentences = find_matching_sentences(verb_forms, SENTENCES)
-    
-    # Select a random matching sentence if available
     selected_sentence = None
-    if matching_sentences:
+    if VERB_SENTENCES:
+        # Only pick verbs that have at least one matching sentence
+        verb, matching_sentences = random.choice(VERB_SENTENCES)
         selected = random.choice(matching_sentences)
         selected_sentence = {
             "english": selected["sentence"]["English"],
@@ -171,7 +121,8 @@ async def get_next_verb():
             "sentence_index": selected["sentence_index"]
         }
     else:
-        print("No matching sentences found for this verb")
+        verb = random.choice(VERBS)
+        print("No matching sentences found for any verb")
     
     return {
         "verb": verb,
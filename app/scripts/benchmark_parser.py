@@ -0,0 +1,130 @@
+"""
+Compare the BeautifulSoup verbformen parser with the lxml extractor on the
+pages in app/scripts/fixtures/verbformen.
+
+Usage:
+    python -m app.scripts.benchmark_parser [--iterations 50] [--fixtures DIR]
+    python -m app.scripts.benchmark_parser --capture Haus gehen schön Xyzzyq
+
+The pages in synthetic/ are hand-built imitations of verbformen.de result
+pages (noun, verb, adjective, compound, not found), not downloads. Real pages
+belong in captured/; --capture downloads them there, named by the encoded
+word. Include a word verbformen.de does not know so a not-found page is
+covered. Until captured/ holds pages, matching output only shows the two
+parsers agree on the synthetic markup, and the report says so.
+
+For every page both implementations must produce the same result; the script
+exits non-zero if any page differs. It then reports the median parse time and
+the peak Python heap used per parse (tracemalloc, so memory libxml2 allocates
+in C is not counted).
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+from urllib.parse import quote
+import httpx
+
+from app.services.verbformen_parser import parse_page
+from app.services.verbformen_extractor import extract_page, lxml_html
+from app.services.verbformen_service import VERBFORMEN_URL
+from app.services.http_client import http_request, close_http_client, UpstreamUnavailable
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "verbformen"
+CAPTURED_DIR = "captured"
+
+def median_ms(fn: Callable, html: str, word: str, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(html, word)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+def peak_kib(fn: Callable, html: str, word: str) -> float:
+    tracemalloc.start()
+    try:
+        fn(html, word)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def benchmark(paths: List[Path], iterations: int) -> List[Dict]:
+    rows = []
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+        word = path.stem
+        rows.append({
+            "page": path.name,
+            "source": path.parent.name,
+            "kib": len(html.encode("utf-8")) / 1024,
+            "identical": parse_page(html, word) == extract_page(html, word),
+            "bs4_ms": median_ms(parse_page, html, word, iterations),
+            "lxml_ms": median_ms(extract_page, html, word, iterations),
+            "bs4_peak": peak_kib(parse_page, html, word),
+            "lxml_peak": peak_kib(extract_page, html, word)
+        })
+    return rows
+
+async def capture(words: List[str], directory: Path) -> None:
+    """Download the result page for each word into directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        for word in words:
+            encoded_word = quote(word)
+            try:
+                response = await http_request("GET", f"{VERBFORMEN_URL}?w={encoded_word}")
+            except (UpstreamUnavailable, httpx.HTTPError) as e:
+                print(f"Failed {word}: {e}")
+                continue
+            if response.status_code != 200:
+                print(f"Skipped {word}: verbformen.de answered {response.status_code}")
+                continue
+            path = directory / f"{encoded_word}.html"
+            path.write_text(response.text, encoding="utf-8")
+            print(f"Saved {word} to {path}")
+    finally:
+        await close_http_client()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark verbformen page parsing")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per page and parser")
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="Directory of synthetic/ and captured/ pages")
+    parser.add_argument("--capture", nargs="+", metavar="WORD", help="Download these words' pages into captured/ first")
+    args = parser.parse_args()
+
+    if args.capture:
+        asyncio.run(capture(args.capture, args.fixtures / CAPTURED_DIR))
+
+    paths = sorted(args.fixtures.glob("*/*.html"))
+    if not paths:
+        sys.exit(f"No .html fixtures in {args.fixtures}")
+    if lxml_html is None:
+        print("lxml is not installed: extract_page falls back to BeautifulSoup")
+
+    rows = benchmark(paths, max(1, args.iterations))
+    print(f"{'page':<20}{'source':<11}{'size KiB':>9}{'same':>6}{'bs4 ms':>9}{'lxml ms':>9}{'speedup':>9}"
+          f"{'bs4 peak KiB':>14}{'lxml peak KiB':>15}")
+    for row in rows:
+        print(f"{row['page']:<20}{row['source']:<11}{row['kib']:>9.1f}{'yes' if row['identical'] else 'NO':>6}"
+              f"{row['bs4_ms']:>9.2f}{row['lxml_ms']:>9.2f}{row['bs4_ms'] / row['lxml_ms']:>8.1f}x"
+              f"{row['bs4_peak']:>14.0f}{row['lxml_peak']:>15.0f}")
+
+    bs4_total = sum(row["bs4_ms"] for row in rows)
+    lxml_total = sum(row["lxml_ms"] for row in rows)
+    print(f"Total: {bs4_total:.2f} ms with BeautifulSoup, {lxml_total:.2f} ms with lxml "
+          f"({bs4_total / lxml_total:.1f}x faster)")
+
+    if not any(row["source"] == CAPTURED_DIR for row in rows):
+        print("Only synthetic pages were checked; add real ones with --capture before relying on parity")
+
+    different = [row["page"] for row in rows if not row["identical"]]
+    if different:
+        sys.exit(f"Output differs for: {', '.join(different)}")
+
+if __name__ == "__main__":
+    main()
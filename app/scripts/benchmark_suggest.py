@@ -0,0 +1,90 @@
+"""
+Measure /api/suggest lookups against an index the size of a large vocabulary.
+
+Usage:
+    python -m app.scripts.benchmark_suggest [--words 20000] [--queries 20000] [--limit 10]
+
+The index holds the learn_vocab.xlsx headwords plus generated compounds of
+them up to --words entries, with random search counts. A sample of results,
+including some taken after counts change, is checked against a full scan of
+the matching keys, and the script reports
+median and 99th percentile latency for short (1-3 character) and longer
+prefixes.
+"""
+import sys
+import time
+import random
+import argparse
+import statistics
+from typing import List
+
+from app.services.suggest_index import SuggestIndex
+from app.services.vocabulary import vocabulary_store
+
+def build_words(total: int, rng: random.Random) -> List[str]:
+    vocabulary = vocabulary_store.current
+    base = [noun["singular"] for noun in vocabulary.nouns] + [verb["infinitive"] for verb in vocabulary.verbs]
+    base = [word.strip() for word in base if word and word.strip()]
+    words = set(base)
+    while len(words) < total:
+        # German-style compounds keep the prefix distribution realistic
+        words.add(rng.choice(base) + rng.choice(base).lower())
+    return list(words)
+
+def full_scan(index: SuggestIndex, prefix: str, limit: int) -> List[str]:
+    key = index._key(prefix)
+    matches = [k for k in index._keys if k.startswith(key)]
+    matches.sort(key=lambda k: (-index._counts[k], len(k), k))
+    return [index._display[k] for k in matches[:limit]]
+
+def percentile(timings: List[float], fraction: float) -> float:
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prefix suggestions")
+    parser.add_argument("--words", type=int, default=20000, help="Index size")
+    parser.add_argument("--queries", type=int, default=20000, help="Timed queries per prefix class")
+    parser.add_argument("--limit", type=int, default=10, help="Suggestions per query")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = build_words(args.words, rng)
+    index = SuggestIndex()
+    started = time.perf_counter()
+    index.bulk_load((word, rng.randint(0, 50)) for word in words)
+    print(f"Built index of {len(index)} words in {time.perf_counter() - started:.2f} s")
+
+    wrong = 0
+    for name, lengths in (("short (1-3)", (1, 2, 3)), ("long (4-8)", (4, 5, 6, 7, 8))):
+        prefixes = []
+        while len(prefixes) < args.queries:
+            word = rng.choice(words)
+            length = rng.choice(lengths)
+            if len(word) >= length:
+                prefixes.append(word[:length])
+        timings = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            index.suggest(prefix, args.limit)
+            timings.append((time.perf_counter() - started) * 1e6)
+        for prefix in prefixes[:500]:
+            if [s["word"] for s in index.suggest(prefix, args.limit)] != full_scan(index, prefix, args.limit):
+                wrong += 1
+        print(f"{name:<12} median {statistics.median(timings):8.1f} µs   p99 {percentile(timings, 0.99):8.1f} µs")
+
+    # Searches shift the precomputed rankings; they must stay exact
+    for word in rng.sample(words, 2000):
+        index.touch(word)
+    for word in rng.sample(words, 500):
+        prefix = word[:rng.choice((1, 2, 3))]
+        if [s["word"] for s in index.suggest(prefix, args.limit)] != full_scan(index, prefix, args.limit):
+            wrong += 1
+
+    if wrong:
+        sys.exit(f"{wrong} queries differ from a full scan")
+    print("All checked queries match a full scan")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Pre-generate GenAI example sentences for every noun and verb in
+resource/learn_vocab.xlsx, so /api/genai/examples can answer from the cache.
+
+Usage:
+    python -m app.scripts.generate_examples [--sheets Noun Verb] [--concurrency 4] [--rpm 60]
+
+Every validated result is committed to the genai_examples table as soon as
+it arrives, and words that already have examples for the current prompt
+version are skipped, so an interrupted run resumes where it stopped. Words
+that failed are retried on the next run.
+"""
+import json
+import time
+import asyncio
+import argparse
+from typing import List
+
+from app.database import init_db
+from app.services.genai_service import genai_service, PROMPT_VERSION
+from app.services.normalize import normalize_word
+from app.services.vocabulary import vocabulary_store
+from app.scripts.warm_cache import RateLimiter
+
+SHEETS = ("Noun", "Verb")
+
+def collect_words(sheets) -> List[str]:
+    """Enumerate unique nouns (singular) and verb infinitives, keeping the first spelling of each key."""
+    vocabulary = vocabulary_store.current
+    words = []
+    if "Noun" in sheets:
+        words.extend(noun["singular"] for noun in vocabulary.nouns)
+    if "Verb" in sheets:
+        words.extend(verb["infinitive"] for verb in vocabulary.verbs)
+    unique = {}
+    for word in words:
+        if word and word.strip():
+            unique.setdefault(normalize_word(word), word.strip())
+    return list(unique.values())
+
+async def generate(words, concurrency: int, rpm: float) -> dict:
+    await init_db()
+
+    done = await genai_service.cached_words()
+    summary = {"generated": 0, "skipped": 0, "failures": 0}
+    failed = []
+    limit = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rpm / 60.0)
+
+    async def generate_one(word: str) -> None:
+        if normalize_word(word) in done:
+            summary["skipped"] += 1
+            return
+        async with limit:
+            await limiter.wait()
+            try:
+                # Validated and committed by the service before it returns
+                await genai_service.get_examples(word)
+            except Exception as e:
+                summary["failures"] += 1
+                failed.append(word)
+                print(f"Failed {word}: {e}")
+                return
+        summary["generated"] += 1
+        if summary["generated"] % 25 == 0:
+            print(f"Generated {summary['generated']} words")
+
+    await asyncio.gather(*(generate_one(word) for word in words))
+    return {"words": len(words), "prompt_version": PROMPT_VERSION, **summary, "failed": failed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate GenAI example sentences for learn_vocab.xlsx")
+    parser.add_argument("--sheets", nargs="+", choices=SHEETS, default=list(SHEETS))
+    parser.add_argument("--concurrency", type=int, default=4, help="Model requests in flight")
+    parser.add_argument("--rpm", type=float, default=60.0, help="Model requests per minute (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="Only generate for the first N words")
+    args = parser.parse_args()
+
+    words = collect_words(args.sheets)
+    if args.limit:
+        words = words[:args.limit]
+    print(f"Generating examples for {len(words)} words from {', '.join(args.sheets)} with {genai_service.model}")
+
+    started = time.monotonic()
+    summary = asyncio.run(generate(words, max(1, args.concurrency), args.rpm))
+    summary["seconds"] = round(time.monotonic() - started, 1)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Switch an existing cache database to incremental vacuum, so PONS cache
+compaction can shrink the file.
+
+Usage:
+    python -m app.scripts.vacuum_db
+
+New database files start in incremental mode. Files created before that stay
+in SQLite's default mode, where deleted rows leave free pages behind and the
+file never gets smaller. Switching needs one full VACUUM, which rewrites the
+whole file: stop the app first and expect it to take a while on a large cache.
+"""
+import time
+import asyncio
+
+from app.database import engine, convert_to_incremental_vacuum, database_file_size
+
+async def run() -> None:
+    async with engine.connect() as conn:
+        mode = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+    if mode == 2:
+        print("Database already uses incremental vacuum")
+        return
+
+    before = await database_file_size()
+    print(f"Rewriting {before / 1024 / 1024:.1f} MiB database ...")
+    started = time.perf_counter()
+    await convert_to_incremental_vacuum()
+    after = await database_file_size()
+    print(f"Done in {time.perf_counter() - started:.1f} s, now {after / 1024 / 1024:.1f} MiB")
+
+def main():
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Pre-fetch every vocabulary word from resource/learn_vocab.xlsx into the PONS
+and verbformen lookup caches.
+
+Usage:
+    python -m app.scripts.warm_cache [--sources verbformen pons] [--concurrency 4] [--rate 2]
+
+Progress is checkpointed to a JSON file, so an interrupted run picks up where
+it stopped. Words that failed are retried on the next run.
+"""
+import re
+import os
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import List, Set
+
+from app.database import init_db
+from app.services.http_client import close_http_client
+from app.services.access_stats import access_stats
+from app.services.lookup_cache import lookup_cache
+from app.services.media_cache import media_cache
+from app.services.verbformen_service import verbformen_service
+from app.services.vocabulary import vocabulary_store
+
+SHEETS = ("Noun", "Verb", "Sentences")
+SOURCES = ("verbformen", "pons")
+DEFAULT_PROGRESS_FILE = Path("app/data/warm_cache_progress.json")
+WORD_PATTERN = re.compile(r"[A-Za-zÄÖÜäöüß]{2,}")
+
+def collect_words(sheets) -> List[str]:
+    """Enumerate unique headwords (nouns, verb infinitives, words used in sentences)."""
+    vocabulary = vocabulary_store.current
+    words = []
+    if "Noun" in sheets:
+        words.extend(noun["singular"] for noun in vocabulary.nouns)
+    if "Verb" in sheets:
+        words.extend(verb["infinitive"] for verb in vocabulary.verbs)
+    if "Sentences" in sheets:
+        for sentence in vocabulary.sentences:
+            for column in ("German", "German example 2"):
+                words.extend(WORD_PATTERN.findall(sentence[column]))
+    return list(dict.fromkeys(word.strip() for word in words if word and word.strip()))
+
+class RateLimiter:
+    """Space out upstream calls to at most `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def load_progress(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    try:
+        with open(path, "r") as f:
+            return set(json.load(f).get("done", []))
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Ignoring unreadable progress file {path}: {e}")
+        return set()
+
+def save_progress(path: Path, done: Set[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"done": sorted(done)}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+async def warm(words, sources, concurrency: int, rate: float, progress_path: Path) -> dict:
+    await init_db()
+    # Without the URL index every media file already on disk would be downloaded again
+    await media_cache.load()
+
+    pons_service = None
+    if "pons" in sources:
+        try:
+            from app.services.pons_service import PonsService
+            pons_service = PonsService()
+        except ValueError as e:
+            print(f"Skipping PONS: {e}")
+            sources = [source for source in sources if source != "pons"]
+
+    done = load_progress(progress_path)
+    summary = {source: {"hits": 0, "misses": 0, "failures": 0, "skipped": 0} for source in sources}
+    failed = []
+    limit = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    completed_since_save = 0
+
+    async def warm_one(word: str, source: str) -> None:
+        nonlocal completed_since_save
+        key = f"{source}:{word}"
+        if key in done:
+            summary[source]["skipped"] += 1
+            return
+        async with limit:
+            try:
+                if source == "verbformen":
+                    if await lookup_cache.get(word):
+                        summary[source]["hits"] += 1
+                    else:
+                        await limiter.wait()
+                        payload = await verbformen_service.fetch_and_cache(word)
+                        # Lookups leave media to background downloads; a warm run fetches it too
+                        await media_cache.store(payload)
+                        summary[source]["misses"] += 1
+                else:
+                    if await pons_service.get_cached_definition(word):
+                        summary[source]["hits"] += 1
+                    else:
+                        await limiter.wait()
+                        response = await pons_service.fetch_definition(word)
+                        error = json.loads(response.result).get("error")
+                        if error:
+                            raise RuntimeError(error)
+                        summary[source]["misses"] += 1
+            except Exception as e:
+                summary[source]["failures"] += 1
+                failed.append(key)
+                print(f"Failed {key}: {e}")
+                return
+
+        done.add(key)
+        completed_since_save += 1
+        if completed_since_save >= 25:
+            save_progress(progress_path, done)
+            completed_since_save = 0
+
+    try:
+        await asyncio.gather(*(warm_one(word, source) for word in words for source in sources))
+    finally:
+        save_progress(progress_path, done)
+        await access_stats.stop()
+        await media_cache.stop()
+        await close_http_client()
+
+    return {"words": len(words), "sources": summary, "failed": failed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the PONS and verbformen caches from learn_vocab.xlsx")
+    parser.add_argument("--sources", nargs="+", choices=SOURCES, default=list(SOURCES))
+    parser.add_argument("--sheets", nargs="+", choices=SHEETS, default=list(SHEETS))
+    parser.add_argument("--concurrency", type=int, default=4, help="Upstream requests in flight")
+    parser.add_argument("--rate", type=float, default=2.0, help="Upstream requests per second (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="Only warm the first N words")
+    parser.add_argument("--progress-file", type=Path, default=DEFAULT_PROGRESS_FILE)
+    parser.add_argument("--reset", action="store_true", help="Ignore previous progress and start over")
+    args = parser.parse_args()
+
+    if args.reset and args.progress_file.exists():
+        args.progress_file.unlink()
+
+    words = collect_words(args.sheets)
+    if args.limit:
+        words = words[:args.limit]
+    print(f"Warming {len(words)} words from {', '.join(args.sheets)} into {', '.join(args.sources)}")
+
+    started = time.monotonic()
+    summary = asyncio.run(warm(words, args.sources, max(1, args.concurrency), args.rate, args.progress_file))
+    summary["seconds"] = round(time.monotonic() - started, 1)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import Dict, Tuple, Optional
+from sqlalchemy import update, bindparam
+from app.database import get_session
+
+ACCESS_STATS_FLUSH_INTERVAL = float(os.getenv("ACCESS_STATS_FLUSH_INTERVAL", "5"))
+
+class AccessStatsBuffer:
+    """Buffer cache-hit statistics in memory and write them back in batched UPDATEs."""
+
+    def __init__(self, interval: float = ACCESS_STATS_FLUSH_INTERVAL):
+        self.interval = interval
+        # (model, word) -> (hits since last flush, last access time)
+        self._pending: Dict[Tuple[type, str], Tuple[int, datetime]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_rows = 0
+
+    def record(self, model: type, word: str) -> None:
+        """Count one access to a cache row with a `word`, `search_count` and `last_accessed` column."""
+        count, _ = self._pending.get((model, word), (0, None))
+        self._pending[(model, word)] = (count + 1, datetime.utcnow())
+
+    async def flush(self) -> int:
+        """Write all buffered statistics, one executemany UPDATE per table."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        by_model: Dict[type, list] = {}
+        for (model, word), (count, last_accessed) in pending.items():
+            by_model.setdefault(model, []).append({
+                "w": word,
+                "n": count,
+                "ts": last_accessed
+            })
+
+        try:
+            async with get_session() as session:
+                for model, params in by_model.items():
+                    table = model.__table__
+                    statement = (
+                        update(table)
+                        .where(table.c.word == bindparam("w"))
+                        .values(
+                            search_count=table.c.search_count + bindparam("n"),
+                            last_accessed=bindparam("ts")
+                        )
+                    )
+                    await session.execute(statement, params)
+                await session.commit()
+        except Exception as e:
+            # Put the counts back so they are retried on the next flush
+            for key, (count, last_accessed) in pending.items():
+                newer_count, newer_access = self._pending.get(key, (0, last_accessed))
+                self._pending[key] = (count + newer_count, max(last_accessed, newer_access))
+            print(f"Error flushing access statistics: {e}")
+            return 0
+
+        self.flushed_rows += len(pending)
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending_rows": len(self._pending),
+            "flushed_rows": self.flushed_rows
+        }
+
+access_stats = AccessStatsBuffer()
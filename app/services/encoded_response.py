@@ -0,0 +1,97 @@
+import os
+import gzip
+import json
+import hashlib
+from typing import Any, Dict, Optional
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1000"))
+# Cache-Control max-age for datasets that only change on a vocabulary reload
+DATASET_MAX_AGE = int(os.getenv("DATASET_MAX_AGE", "300"))
+# Cache-Control max-age for /api/lookup payloads
+LOOKUP_MAX_AGE = int(os.getenv("LOOKUP_MAX_AGE", "3600"))
+
+class EncodedJSON:
+    """A JSON body encoded once, with its compressed variants and a strong ETag."""
+
+    def __init__(self, data: Any, compress_level: int = 9):
+        self.body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.encodings: Dict[str, bytes] = {}
+        if len(self.body) >= COMPRESS_MIN_SIZE:
+            self.encodings["gzip"] = gzip.compress(self.body, compress_level)
+            if brotli is not None:
+                self.encodings["br"] = brotli.compress(self.body, quality=min(compress_level + 2, 11))
+
+    def _pick_encoding(self, accept_encoding: str) -> Optional[str]:
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and encoding in accepted:
+                return encoding
+        return None
+
+    def response(self, request: Request, max_age: int = DATASET_MAX_AGE) -> Response:
+        """Answer with the best encoding the client accepts, or 304 if its copy is current."""
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={max_age}",
+            "Vary": "Accept-Encoding"
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if self.etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+
+        encoding = self._pick_encoding(request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            body = self.encodings[encoding]
+        else:
+            body = self.body
+        return Response(content=body, media_type="application/json; charset=utf-8", headers=headers)
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+def json_response(request: Request, data: Any, max_age: int) -> Response:
+    """Encode a per-request payload once and answer with ETag/304 and compression."""
+    # Lower level than the pre-encoded datasets: this runs on every request
+    return EncodedJSON(data, compress_level=6).response(request, max_age)
+
+STREAMING_MEDIA_TYPES = ("application/x-ndjson", "text/event-stream")
+# Formats that are compressed already; gzipping them only costs CPU
+COMPRESSED_MEDIA_TYPES = ("image/png", "image/jpeg", "image/gif", "image/webp", "audio/", "video/")
+
+class _CompressionResponder(GZipResponder):
+    passthrough = False
+
+    async def send_with_gzip(self, message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            # Leave pre-encoded bodies, compressed media and line-by-line streams (which must flush per line) alone
+            content_type = headers.get("content-type", "")
+            self.passthrough = ("content-encoding" in headers
+                                or content_type.startswith(STREAMING_MEDIA_TYPES)
+                                or content_type.startswith(COMPRESSED_MEDIA_TYPES))
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips responses which are already compressed or streamed line by line."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            await _CompressionResponder(self.app, self.minimum_size)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,262 @@
+import os
+import json
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from sqlmodel import select
+from sqlalchemy.exc import IntegrityError
+from app.models import GenaiExamples
+from app.database import get_session
+from app.services.normalize import normalize_word
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+# Point at any OpenAI-compatible server, e.g. a local stand-in model for tests
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+# Bump whenever the prompt changes so examples are regenerated
+PROMPT_VERSION = 1
+
+def build_prompt(word: str) -> str:
+    return (
+        f"Give me 5 short daily-use example sentences in German using the word '{word}'. "
+        "Each sentence should be followed by its English translation. "
+        "Return the result as a JSON array like: "
+        "[{\"de\": \"German sentence\", \"en\": \"English translation\"}]"
+    )
+
+def validate_examples(examples: List[Dict[str, str]]) -> None:
+    """Raise ValueError unless every example has non-empty German and English text."""
+    if not examples:
+        raise ValueError("Model returned no examples")
+    for example in examples:
+        if not example["de"].strip() or not example["en"].strip():
+            raise ValueError(f"Incomplete example: {example}")
+
+def _object_end(text: str, start: int) -> int:
+    """Index just past the brace closing the object that opens at `start`, or -1 if it has not arrived yet."""
+    depth = 0
+    in_string = escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return -1
+
+class ExampleParser:
+    """Pull complete {"de", "en"} objects out of a JSON array as its text streams in."""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self.skipped = 0
+
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        self._buffer += text
+        examples = []
+        while True:
+            start = self._buffer.find("{", self._position)
+            if start == -1:
+                return examples
+            end = _object_end(self._buffer, start)
+            if end == -1:
+                # Object not complete yet
+                return examples
+            self._position = end
+            try:
+                value = self._decoder.decode(self._buffer[start:end])
+            except json.JSONDecodeError:
+                # A malformed object is dropped; the examples after it still count
+                self.skipped += 1
+                continue
+            if isinstance(value, dict) and "de" in value and "en" in value:
+                examples.append({"de": str(value["de"]), "en": str(value["en"])})
+
+class ExampleStream:
+    """Examples of one in-flight generation, readable by any number of followers as they arrive."""
+
+    def __init__(self):
+        self.examples: List[Dict[str, str]] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._changed = asyncio.Condition()
+
+    async def publish(self, examples: List[Dict[str, str]]) -> None:
+        async with self._changed:
+            self.examples.extend(examples)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[Exception] = None) -> None:
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[Dict[str, str]]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.examples) or self.done)
+                ready = self.examples[index:]
+                finished, error = self.done, self.error
+            for example in ready:
+                yield example
+            index += len(ready)
+            if finished and index >= len(self.examples):
+                if error:
+                    raise error
+                return
+
+class GenaiService:
+    """
+    Example sentences from an OpenAI-compatible chat model, cached in SQLite
+    per (word, prompt version). Concurrent requests for a word share one
+    generation, and streaming callers receive each sentence as it is parsed.
+    """
+
+    def __init__(self, client: Any = None, model: str = OPENAI_MODEL):
+        self._client = client
+        self.model = model
+        self._streams: Dict[str, ExampleStream] = {}
+        # Generations in flight, kept so shutdown can cancel them
+        self._tasks: Set[asyncio.Task] = set()
+        self.generated = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    def set_client(self, client: Any, model: Optional[str] = None) -> None:
+        """Swap in another client exposing `await chat.completions.create(...)`."""
+        self._client = client
+        if model:
+            self.model = model
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            # Created on first use so the app starts without an API key
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=OPENAI_BASE_URL,
+                timeout=OPENAI_TIMEOUT,
+                max_retries=1
+            )
+        return self._client
+
+    async def cached_words(self) -> Set[str]:
+        """Normalized words that already have examples for the current prompt."""
+        async with get_session() as session:
+            result = await session.execute(
+                select(GenaiExamples.word).where(GenaiExamples.prompt_version == PROMPT_VERSION)
+            )
+            return set(result.scalars())
+
+    async def get_cached_examples(self, word: str) -> Optional[List[Dict[str, str]]]:
+        async with get_session() as session:
+            statement = select(GenaiExamples).where(
+                GenaiExamples.word == normalize_word(word),
+                GenaiExamples.prompt_version == PROMPT_VERSION
+            )
+            result = await session.execute(statement)
+            cached = result.scalar_one_or_none()
+        return json.loads(cached.examples) if cached else None
+
+    async def save_examples(self, word: str, examples: List[Dict[str, str]]) -> None:
+        try:
+            async with get_session() as session:
+                session.add(GenaiExamples(
+                    word=normalize_word(word),
+                    prompt_version=PROMPT_VERSION,
+                    examples=json.dumps(examples, ensure_ascii=False),
+                    model=self.model
+                ))
+                await session.commit()
+        except IntegrityError:
+            # Another worker stored the same word first
+            pass
+
+    async def _generate_into(self, word: str, stream: ExampleStream) -> None:
+        try:
+            parser = ExampleParser()
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": build_prompt(word)}],
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    examples = parser.feed(chunk.choices[0].delta.content)
+                    if examples:
+                        await stream.publish(examples)
+            validate_examples(stream.examples)
+            self.generated += 1
+            await self.save_examples(word, stream.examples)
+            await stream.finish()
+        except asyncio.CancelledError:
+            # Release followers instead of leaving them waiting on a generation that will not finish
+            await stream.finish(RuntimeError("Example generation was cancelled"))
+            raise
+        except Exception as e:
+            await stream.finish(e)
+
+    async def stream_examples(self, word: str) -> Tuple[bool, AsyncIterator[Dict[str, str]]]:
+        """Return (is_cached, examples as they become available)."""
+        cached = await self.get_cached_examples(word)
+        if cached is not None:
+            self.cache_hits += 1
+            return True, self._iterate(cached)
+
+        key = normalize_word(word)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = ExampleStream()
+            self._streams[key] = stream
+            # Runs to completion even if every caller disconnects, so the result still gets cached
+            task = asyncio.ensure_future(self._generate_into(word, stream))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _: self._streams.pop(key, None))
+        else:
+            self.coalesced += 1
+        return False, stream.follow()
+
+    async def _iterate(self, examples: List[Dict[str, str]]) -> AsyncIterator[Dict[str, str]]:
+        for example in examples:
+            yield example
+
+    async def get_examples(self, word: str) -> Tuple[List[Dict[str, str]], bool]:
+        """Return (examples, is_cached)."""
+        is_cached, examples = await self.stream_examples(word)
+        return [example async for example in examples], is_cached
+
+    async def stop(self) -> None:
+        """Cancel generations still in flight and wait for them to finish."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "prompt_version": PROMPT_VERSION,
+            "generated": self.generated,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._streams)
+        }
+
+genai_service = GenaiService()
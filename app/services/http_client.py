@@ -0,0 +1,219 @@
+import os
+import time
+import random
+import asyncio
+import importlib.util
+from typing import Any, Optional, Dict
+from urllib.parse import urlsplit
+import httpx
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))
+# Token bucket per host: sustained requests per second and burst size
+HTTP_RATE_PER_HOST = float(os.getenv("HTTP_RATE_PER_HOST", "5"))
+HTTP_BURST_PER_HOST = int(os.getenv("HTTP_BURST_PER_HOST", "10"))
+# Longest a request may wait for a token before failing fast
+HTTP_MAX_RATE_WAIT = float(os.getenv("HTTP_MAX_RATE_WAIT", "2"))
+# Background media downloads have their own bucket per host and may wait longer for it,
+# so they never use up the rate that lookups are waiting on
+HTTP_MEDIA_RATE_PER_HOST = float(os.getenv("HTTP_MEDIA_RATE_PER_HOST", "2"))
+HTTP_MEDIA_BURST_PER_HOST = int(os.getenv("HTTP_MEDIA_BURST_PER_HOST", "4"))
+HTTP_MEDIA_MAX_RATE_WAIT = float(os.getenv("HTTP_MEDIA_MAX_RATE_WAIT", "30"))
+# Retries of idempotent requests after timeouts, connection errors, 429 and 5xx
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.2"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "2"))
+# Consecutive failures that open a host's circuit, and seconds before a trial request
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", "5"))
+HTTP_BREAKER_RESET = float(os.getenv("HTTP_BREAKER_RESET", "30"))
+
+# Rate budgets: (requests per second, burst, longest wait for a token)
+BUDGETS = {
+    "default": (HTTP_RATE_PER_HOST, HTTP_BURST_PER_HOST, HTTP_MAX_RATE_WAIT),
+    "media": (HTTP_MEDIA_RATE_PER_HOST, HTTP_MEDIA_BURST_PER_HOST, HTTP_MEDIA_MAX_RATE_WAIT)
+}
+
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# HTTP/2 needs the optional "h2" package (installed with httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.AsyncClient] = None
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+
+class UpstreamUnavailable(Exception):
+    """Raised without contacting the host when its circuit is open or its rate budget is exhausted."""
+
+class TokenBucket:
+    """Allow `rate` requests per second on average with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self, max_wait: float) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        if wait > max_wait:
+            raise UpstreamUnavailable(f"Rate limit budget exhausted (next slot in {wait:.1f}s)")
+        # Reserve the token now (possibly going negative) so later callers queue behind us
+        self.tokens -= 1
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class CircuitBreaker:
+    """
+    Closed: requests flow and consecutive failures are counted. Open: requests
+    fail fast for `reset_timeout` seconds. Half-open: one trial request decides
+    whether to close again or stay open.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        # A trial that never reported back is retried after another reset_timeout
+        if self.state != "closed" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self.opened_at = time.monotonic()
+            return True
+        if self.state == "closed":
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"Circuit opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+class _Upstream:
+    def __init__(self, budget: str):
+        rate, burst, self.max_wait = BUDGETS[budget]
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(HTTP_BREAKER_FAILURES, HTTP_BREAKER_RESET)
+        self.retries = 0
+
+_upstreams: Dict[str, _Upstream] = {}
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        follow_redirects=True,
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE
+        )
+    )
+
+async def start_http_client() -> None:
+    """Create the application-wide client. Called on app startup."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections. Called on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_limits.clear()
+    _upstreams.clear()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifecycle (e.g. scripts)."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+def _host_limit(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_limits:
+        _host_limits[host] = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+    return _host_limits[host]
+
+def _upstream(url: str, budget: str) -> _Upstream:
+    host = urlsplit(url).netloc
+    key = host if budget == "default" else f"{host} ({budget})"
+    if key not in _upstreams:
+        _upstreams[key] = _Upstream(budget)
+    return _upstreams[key]
+
+def _backoff(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Exponential backoff with full jitter, or the server's Retry-After if it is short enough."""
+    retry_after = response.headers.get("retry-after", "") if response is not None else ""
+    if retry_after.isdigit() and int(retry_after) <= HTTP_BACKOFF_MAX:
+        return float(retry_after)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+async def http_request(method: str, url: str, budget: str = "default", **kwargs) -> httpx.Response:
+    """
+    Send a request through the shared pool, capped at HTTP_MAX_PER_HOST in
+    flight and HTTP_RATE_PER_HOST per second per host. Idempotent requests are
+    retried with backoff on transient failures. While the host's circuit is
+    open this raises UpstreamUnavailable immediately instead of waiting on it.
+    After the last retry a 429/5xx response is returned for the caller to handle.
+    `budget` names the rate budget and circuit to use, one of BUDGETS.
+    """
+    upstream = _upstream(url, budget)
+    attempts = 1 + (HTTP_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0)
+    for attempt in range(attempts):
+        if not upstream.breaker.allow():
+            raise UpstreamUnavailable(f"{urlsplit(url).netloc} is unavailable, try again later")
+        await upstream.bucket.acquire(upstream.max_wait)
+
+        response = None
+        try:
+            async with _host_limit(url):
+                response = await get_http_client().request(method, url, **kwargs)
+        except httpx.TransportError:
+            upstream.breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES and response.status_code < 500:
+                upstream.breaker.record_success()
+                return response
+            upstream.breaker.record_failure()
+            if attempt == attempts - 1:
+                return response
+
+        upstream.retries += 1
+        await asyncio.sleep(_backoff(attempt, response))
+
+def upstream_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        host: {
+            "circuit": upstream.breaker.state,
+            "consecutive_failures": upstream.breaker.failures,
+            "rejected": upstream.breaker.rejected,
+            "retries": upstream.retries,
+            "tokens": round(upstream.bucket.tokens, 2)
+        }
+        for host, upstream in _upstreams.items()
+    }
@@ -0,0 +1,125 @@
+import os
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any
+from sqlmodel import select
+from sqlalchemy.exc import IntegrityError
+from app.models import VerbformenCache
+from app.database import get_session
+from app.services.access_stats import access_stats
+from app.services.suggest_index import suggest_index
+from app.services.normalize import normalize_word
+
+LOOKUP_CACHE_SIZE = int(os.getenv("LOOKUP_CACHE_SIZE", "4096"))
+LOOKUP_CACHE_TTL = int(os.getenv("LOOKUP_CACHE_TTL", str(7 * 24 * 3600)))
+
+class LookupCache:
+    """Two-tier cache for assembled /api/lookup payloads: in-process LRU in front of SQLite."""
+
+    def __init__(self, maxsize: int = LOOKUP_CACHE_SIZE, ttl: int = LOOKUP_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # word -> (expires_at on the monotonic clock, payload)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, word: str, payload: Dict[str, Any], expires_at: float) -> None:
+        self._entries[word] = (expires_at, payload)
+        self._entries.move_to_end(word)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get(self, word: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a word, or None if missing or expired."""
+        key = normalize_word(word)
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, payload = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                access_stats.record(VerbformenCache, key)
+                suggest_index.touch(word)
+                return payload
+            del self._entries[key]
+
+        async with get_session() as session:
+            statement = select(VerbformenCache).where(VerbformenCache.word == key)
+            result = await session.execute(statement)
+            cached_result = result.scalar_one_or_none()
+
+            if cached_result:
+                age = (datetime.utcnow() - cached_result.created_at).total_seconds()
+                if age < self.ttl:
+                    access_stats.record(VerbformenCache, key)
+                    suggest_index.touch(word)
+                    payload = json.loads(cached_result.payload)
+                    self._remember(key, payload, time.monotonic() + self.ttl - age)
+                    self.db_hits += 1
+                    return payload
+
+        self.misses += 1
+        return None
+
+    async def get_stale(self, word: str) -> Optional[Dict[str, Any]]:
+        """Return the stored payload regardless of age, for when upstream is down. Not counted in stats."""
+        key = normalize_word(word)
+        entry = self._entries.get(key)
+        if entry:
+            return entry[1]
+        async with get_session() as session:
+            statement = select(VerbformenCache.payload).where(VerbformenCache.word == key)
+            result = await session.execute(statement)
+            payload = result.scalar_one_or_none()
+        return json.loads(payload) if payload else None
+
+    async def set(self, word: str, payload: Dict[str, Any]) -> None:
+        """Store a payload in both tiers, replacing any expired row."""
+        key = normalize_word(word)
+        self._remember(key, payload, time.monotonic() + self.ttl)
+        suggest_index.touch(word)
+
+        try:
+            async with get_session() as session:
+                statement = select(VerbformenCache).where(VerbformenCache.word == key)
+                result = await session.execute(statement)
+                cache_entry = result.scalar_one_or_none()
+
+                now = datetime.utcnow()
+                if cache_entry:
+                    cache_entry.payload = json.dumps(payload)
+                    cache_entry.created_at = now
+                    cache_entry.last_accessed = now
+                    cache_entry.display_word = cache_entry.display_word or word.strip()
+                else:
+                    cache_entry = VerbformenCache(
+                        word=key,
+                        display_word=word.strip(),
+                        payload=json.dumps(payload),
+                        created_at=now,
+                        last_accessed=now
+                    )
+                session.add(cache_entry)
+                await session.commit()
+        except IntegrityError:
+            # Another worker stored the same word first
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.db_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._entries),
+            "memory_capacity": self.maxsize,
+            "ttl_seconds": self.ttl
+        }
+
+lookup_cache = LookupCache()
@@ -0,0 +1,185 @@
+import os
+import re
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+import httpx
+from sqlmodel import select
+from starlette.concurrency import run_in_threadpool
+from app.models import MediaAsset
+from app.database import get_session
+from app.services.http_client import http_request, UpstreamUnavailable
+from app.services.singleflight import singleflight
+
+MEDIA_CACHE_DIR = Path(os.getenv("MEDIA_CACHE_DIR", "app/data/media"))
+# Files are named by content hash and never change, so browsers may keep them for a year
+MEDIA_MAX_AGE = int(os.getenv("MEDIA_MAX_AGE", str(365 * 24 * 3600)))
+# How long a URL upstream had no file for is remembered before it is checked again
+MEDIA_MISSING_TTL = int(os.getenv("MEDIA_MISSING_TTL", str(7 * 24 * 3600)))
+MEDIA_ROUTE = "/media"
+MEDIA_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".mp3", ".ogg"}
+# Payload fields that hold upstream media URLs
+MEDIA_FIELDS = ("verb_image_url", "word_sound")
+
+FILE_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+def _write_file(path: Path, body: bytes) -> None:
+    if path.exists():
+        # Same content already stored for another URL
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_bytes(body)
+    os.replace(temp_path, path)
+
+class MediaCache:
+    """
+    Images and sounds from verbformen.de fetched once into a content-addressed
+    directory and served from MEDIA_ROUTE. Which URLs exist (and which do not)
+    is kept in memory and in the media_assets table, so lookups never wait on
+    an upstream existence check for a URL seen before.
+    """
+
+    def __init__(self, directory: Path = MEDIA_CACHE_DIR, missing_ttl: int = MEDIA_MISSING_TTL):
+        self.directory = directory
+        self.missing_ttl = missing_ttl
+        # url -> (file name, or None if missing upstream, and when it was fetched)
+        self._known: Dict[str, Tuple[Optional[str], datetime]] = {}
+        # Background downloads started by localize(), kept so shutdown can cancel them
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.fetched = 0
+        self.missing = 0
+        self.failures = 0
+
+    def path_for(self, file_name: str) -> Optional[Path]:
+        """Path of a stored file, or None if the name is not one this cache hands out."""
+        if not FILE_NAME_PATTERN.match(file_name) or Path(file_name).suffix not in MEDIA_EXTENSIONS:
+            return None
+        return self.directory / file_name[:2] / file_name
+
+    def _has_file(self, file_name: str) -> bool:
+        path = self.path_for(file_name)
+        return path is not None and path.exists()
+
+    async def load(self) -> None:
+        """Read the URL index from the database, dropping entries whose file has gone from disk."""
+        async with get_session() as session:
+            result = await session.execute(select(MediaAsset))
+            assets = result.scalars().all()
+        self._known = {
+            asset.url: (asset.file_name, asset.fetched_at)
+            for asset in assets
+            if asset.file_name is None or self._has_file(asset.file_name)
+        }
+        print(f"Media cache: {len(self._known)} known URLs")
+
+    def _lookup(self, url: str) -> Tuple[bool, Optional[str]]:
+        """Return (known, local URL or None if missing upstream)."""
+        entry = self._known.get(url)
+        if entry is None:
+            return False, None
+        file_name, fetched_at = entry
+        if file_name is None:
+            if datetime.utcnow() - fetched_at > timedelta(seconds=self.missing_ttl):
+                return False, None
+            return True, None
+        self.hits += 1
+        return True, f"{MEDIA_ROUTE}/{file_name}"
+
+    async def resolve(self, url: str) -> Optional[str]:
+        """
+        Return the local URL for an upstream file, downloading it on first use,
+        or None if upstream has no such file. If the download fails for any
+        other reason the upstream URL is returned and retried next time.
+        """
+        if Path(urlparse(url).path).suffix.lower() not in MEDIA_EXTENSIONS:
+            return url
+        known, local_url = self._lookup(url)
+        if known:
+            return local_url
+        try:
+            return await singleflight.do(f"media:{url}", lambda: self._fetch(url))
+        except (UpstreamUnavailable, httpx.HTTPError) as e:
+            self.failures += 1
+            print(f"Error fetching media {url}: {e}")
+            return url
+
+    async def _fetch(self, url: str) -> Optional[str]:
+        response = await http_request("GET", url, budget="media", follow_redirects=False)
+        if response.status_code == 429 or response.status_code >= 500:
+            raise UpstreamUnavailable(f"{urlparse(url).netloc} answered {response.status_code}")
+
+        file_name = None
+        if response.status_code == 200:
+            body = response.content
+            file_name = hashlib.sha256(body).hexdigest() + Path(urlparse(url).path).suffix.lower()
+            await run_in_threadpool(_write_file, self.path_for(file_name), body)
+            self.fetched += 1
+        else:
+            # 404, or a redirect to a placeholder: treat as not there
+            self.missing += 1
+
+        asset = MediaAsset(url=url, file_name=file_name, size=len(response.content) if file_name else 0)
+        async with get_session() as session:
+            await session.merge(asset)
+            await session.commit()
+        self._known[url] = (file_name, asset.fetched_at)
+        return f"{MEDIA_ROUTE}/{file_name}" if file_name else None
+
+    async def _prefetch(self, url: str) -> None:
+        try:
+            await self.resolve(url)
+        except Exception as e:
+            print(f"Error prefetching media {url}: {e}")
+
+    def localize(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Point the payload's media URLs at the local copies. URLs not seen yet
+        keep their upstream address for this response and are fetched in the
+        background, so the next response for the word is served locally.
+        """
+        localized = dict(payload)
+        for field in MEDIA_FIELDS:
+            url = payload.get(field)
+            if not url or url.startswith(MEDIA_ROUTE):
+                continue
+            known, local_url = self._lookup(url)
+            if known:
+                localized[field] = local_url
+            else:
+                self._schedule_prefetch(url)
+        return localized
+
+    def _schedule_prefetch(self, url: str) -> None:
+        # Repeat requests for the same URL share one download through singleflight
+        task = asyncio.ensure_future(self._prefetch(url))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """Cancel background downloads and wait for them to finish."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def store(self, payload: Dict[str, Any]) -> None:
+        """Download the payload's media now and wait for it, for scripts that warm the caches."""
+        await asyncio.gather(*(self.resolve(payload[field]) for field in MEDIA_FIELDS if payload.get(field)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "known_urls": len(self._known),
+            "stored": sum(1 for file_name, _ in self._known.values() if file_name),
+            "hits": self.hits,
+            "fetched": self.fetched,
+            "missing": self.missing,
+            "failures": self.failures,
+            "prefetching": len(self._tasks)
+        }
+
+media_cache = MediaCache()
@@ -0,0 +1,59 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", "3600"))
+NEGATIVE_CACHE_SIZE = int(os.getenv("NEGATIVE_CACHE_SIZE", "10000"))
+
+class NegativeCache:
+    """
+    Short-lived memory of words an upstream had no result for, per source, so
+    retrying a misspelled word does not go upstream again. Kept apart from the
+    regular caches so misses neither take their space nor feed suggestions.
+    Entries are keyed by the word exactly as it was sent upstream: spellings
+    that normalize alike (Strasse, Straße) can still get different answers.
+    """
+
+    def __init__(self, maxsize: int = NEGATIVE_CACHE_SIZE, ttl: int = NEGATIVE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # (source, word as sent upstream) -> (expires_at on the monotonic clock, response to replay)
+        self._entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self.hits = 0
+        self.stored = 0
+        self.expired = 0
+
+    def get(self, source: str, word: str) -> Optional[Any]:
+        """Return the remembered empty response, or None if the word is not known to be missing."""
+        key = (source, word)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expired += 1
+            return None
+        self.hits += 1
+        return response
+
+    def add(self, source: str, word: str, response: Any) -> None:
+        key = (source, word)
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        self.stored += 1
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "stored": self.stored,
+            "expired": self.expired,
+            "entries": len(self._entries),
+            "capacity": self.maxsize,
+            "ttl_seconds": self.ttl
+        }
+
+negative_cache = NegativeCache()
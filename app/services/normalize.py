@@ -0,0 +1,48 @@
+from typing import Dict
+from sqlmodel import select
+from app.database import get_session
+
+# casefold() already turns ß into ss
+UMLAUT_FOLDING = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+
+def normalize_word(word: str) -> str:
+    """Cache and index key for a word: trimmed, case-folded, umlauts spelled out (Mädchen -> maedchen)."""
+    return " ".join(word.split()).casefold().translate(UMLAUT_FOLDING)
+
+async def normalize_cache_keys(model: type) -> int:
+    """Rewrite `word` keys of a cache table to normalize_word(), merging rows that collapse together."""
+    renamed = 0
+    async with get_session() as session:
+        result = await session.execute(select(model.word))
+        if all(normalize_word(word) == word for word in result.scalars()):
+            return 0
+
+        result = await session.execute(select(model))
+        rows = result.scalars().all()
+
+        # Keep the most searched row per normalized key
+        keep: Dict[str, object] = {}
+        for row in rows:
+            key = normalize_word(row.word)
+            current = keep.get(key)
+            if current is None or row.search_count > current.search_count:
+                keep[key] = row
+
+        for row in rows:
+            key = normalize_word(row.word)
+            winner = keep[key]
+            if row is not winner:
+                winner.search_count += row.search_count
+                winner.last_accessed = max(winner.last_accessed, row.last_accessed)
+                await session.delete(row)
+                renamed += 1
+        # Flush deletes before renaming so the unique index never sees duplicates
+        await session.flush()
+
+        for key, row in keep.items():
+            if row.word != key:
+                row.word = key
+                session.add(row)
+                renamed += 1
+        await session.commit()
+    return renamed
@@ -0,0 +1,94 @@
+import os
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+# "process" spreads parsing across cores; "thread" avoids pickling when pages are small
+PARSE_POOL_KIND = os.getenv("PARSE_POOL_KIND", "process")
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", str(os.cpu_count() or 2)))
+# Jobs allowed to wait for a free worker before /api/lookup answers 503; batch lookups and scripts queue instead
+PARSE_POOL_QUEUE = int(os.getenv("PARSE_POOL_QUEUE", str(4 * PARSE_POOL_WORKERS)))
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when every worker is busy and the queue is full."""
+
+class ParsePool:
+    """Run CPU-bound functions on a worker pool, with a bounded backlog so overload fails fast."""
+
+    def __init__(self, kind: str = PARSE_POOL_KIND, workers: int = PARSE_POOL_WORKERS, queue: int = PARSE_POOL_QUEUE):
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue)
+        self._executor: Optional[Executor] = None
+        # Created on first use, inside the running event loop
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.pending = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args, wait: bool = False) -> Any:
+        """
+        Run fn(*args) on a worker. fn and its arguments must be picklable for the
+        process pool. When the backlog is full this raises PoolSaturated, or with
+        wait=True queues for the next free slot; callers that already bound their
+        own concurrency (batch lookup, scripts) should wait rather than fail.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.capacity)
+        if self._slots.locked():
+            if not wait:
+                self.rejected += 1
+                raise PoolSaturated(f"Parser busy ({self.pending} jobs pending), try again shortly")
+            self.waiting += 1
+            try:
+                await self._slots.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.pending += 1
+        try:
+            loop = asyncio.get_event_loop()
+            executor = self._get_executor()
+            try:
+                result = await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory): start a fresh pool and retry once.
+                # Other jobs that hit the same broken pool may already have replaced it.
+                if self._executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+                result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+            self._slots.release()
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self.pending,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+parse_pool = ParsePool()
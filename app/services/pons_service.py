@@ -1,17 +1,36 @@
 import os
 import json
-from datetime import datetime
+import zlib
+import asyncio
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-import httpx
 from dotenv import load_dotenv
 from sqlmodel import select
+from sqlalchemy import func, delete
+from sqlalchemy.exc import IntegrityError
 from app.models import PonsCache, PonsResponse
-from app.database import get_session
+from app.database import get_session, incremental_vacuum, database_file_size
+from app.services.http_client import http_request
+from app.services.singleflight import singleflight
+from app.services.access_stats import access_stats
+from app.services.suggest_index import suggest_index
+from app.services.normalize import normalize_word
+from app.services.negative_cache import negative_cache
 
 load_dotenv()
 
 PONS_API_KEY = os.getenv("PONS_API_KEY")
 PONS_API_URL = "https://api.pons.com/v1/dictionary"
+# Version of the stored format, see PonsCache.schema_version
+PONS_CACHE_SCHEMA_VERSION = 3
+# Entries older than this are served stale while a background refresh runs
+PONS_CACHE_TTL = int(os.getenv("PONS_CACHE_TTL", str(30 * 24 * 3600)))
+# Compressed result bytes the table may hold before compaction evicts the least valuable rows.
+# This bounds the logical payload size; the file shrinks to match through incremental vacuum.
+PONS_CACHE_MAX_BYTES = int(os.getenv("PONS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+PONS_CACHE_COMPACT_INTERVAL = float(os.getenv("PONS_CACHE_COMPACT_INTERVAL", "600"))
+# Days after which an unused row's search_count counts half in the eviction score
+PONS_CACHE_DECAY_DAYS = float(os.getenv("PONS_CACHE_DECAY_DAYS", "30"))
 
 class PonsService:
     def __init__(self):
@@ -21,6 +40,12 @@ class PonsService:
         self.headers = {
             "X-Secret": PONS_API_KEY
         }
+        # Normalized word -> background refresh of its stale entry, kept so shutdown can cancel it
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._compaction_task: Optional[asyncio.Task] = None
+        self.stale_served = 0
+        self.refreshes = 0
+        self.evicted = 0
 
     def _parse_pons_response(self, response_text: str) -> List[Dict[str, str]]:
         """Parse PONS API response into the format expected by the frontend."""
@@ -64,87 +89,265 @@ class PonsService:
             print(f"Error parsing PONS response: {e}")
             return []
 
+    def _serialize_translations(self, response_text: str) -> str:
+        """Turn a raw PONS API body into the serialized result served to clients."""
+        translations = self._parse_pons_response(response_text)
+        return json.dumps({"translations": translations})
+
+    def _read_result(self, cache_entry: PonsCache) -> str:
+        """Return the serialized result of a row in any schema version."""
+        if cache_entry.schema_version >= 3:
+            return zlib.decompress(cache_entry.body).decode("utf-8")
+        if cache_entry.schema_version == 2:
+            return cache_entry.result
+        return self._serialize_translations(cache_entry.result)
+
+    def _write_result(self, cache_entry: PonsCache, result: str) -> None:
+        cache_entry.body = zlib.compress(result.encode("utf-8"), 6)
+        cache_entry.result = ""
+        cache_entry.schema_version = PONS_CACHE_SCHEMA_VERSION
+
+    async def get_cached_definition(self, word: str) -> Optional[PonsResponse]:
+        """Get word definition from cache only, without calling the API."""
+        # A miss is remembered per spelling while results are cached per normalized key,
+        # so a result stored via another spelling (Straße for Strasse) wins over the miss
+        cached_result = await self._get_from_cache(word) or negative_cache.get("pons", word)
+        if cached_result:
+            return PonsResponse(
+                word=word,
+                result=cached_result,
+                is_cached=True
+            )
+        return None
+
     async def get_definition(self, word: str) -> PonsResponse:
         """Get word definition from PONS API with caching."""
-        async with httpx.AsyncClient() as client:
-            # First check cache
-            cached_result = await self._get_from_cache(word)
-            if cached_result:
-                translations = self._parse_pons_response(cached_result.result)
+        # First check cache
+        cached_response = await self.get_cached_definition(word)
+        if cached_response:
+            return cached_response
+
+        # If not in cache, call API
+        return await self.fetch_definition(word)
+
+    async def fetch_definition(self, word: str) -> PonsResponse:
+        """Call the API, once for all concurrent callers of the same word."""
+        return await singleflight.do(f"pons:{normalize_word(word)}", lambda: self._fetch_definition(word))
+
+    async def _fetch_definition(self, word: str) -> PonsResponse:
+        """Call the PONS API and cache a successful response."""
+        try:
+            response = await http_request(
+                "GET",
+                f"{PONS_API_URL}?q={word}&l=deen",
+                headers=self.headers
+            )
+            
+            translations = self._parse_pons_response(response.text) if response.status_code == 200 else []
+            if response.status_code in (200, 204, 404) and not translations:
+                # PONS has nothing for this word (it answers 204 for unknown words)
+                result = json.dumps({"translations": []})
+                negative_cache.add("pons", word, result)
                 return PonsResponse(
                     word=word,
-                    result=json.dumps({"translations": translations}),
-                    is_cached=True
+                    result=result,
+                    is_cached=False
                 )
-
-            # If not in cache, call API
-            try:
-                response = await client.get(
-                    f"{PONS_API_URL}?q={word}&l=deen",
-                    headers=self.headers
+            elif response.status_code == 200:
+                # Cache the parsed result so hits skip the parse/serialize cycle
+                result = json.dumps({"translations": translations})
+                await self._save_to_cache(word, result)
+                return PonsResponse(
+                    word=word,
+                    result=result,
+                    is_cached=False
                 )
-                
-                if response.status_code == 200:
-                    # Cache successful response
-                    await self._save_to_cache(word, response.text)
-                    translations = self._parse_pons_response(response.text)
-                    return PonsResponse(
-                        word=word,
-                        result=json.dumps({"translations": translations}),
-                        is_cached=False
-                    )
-                elif response.status_code == 429:
-                    # If quota exceeded, try to get from cache again
-                    cached_result = await self._get_from_cache(word)
-                    if cached_result:
-                        translations = self._parse_pons_response(cached_result.result)
-                        return PonsResponse(
-                            word=word,
-                            result=json.dumps({"translations": translations}),
-                            is_cached=True
-                        )
-                    return PonsResponse(
-                        word=word,
-                        result=json.dumps({"translations": [], "error": "API quota reached, no cached result available"}),
-                        is_cached=False
-                    )
-                else:
+            elif response.status_code == 429:
+                # If quota exceeded, try to get from cache again
+                cached_result = await self._get_from_cache(word)
+                if cached_result:
                     return PonsResponse(
                         word=word,
-                        result=json.dumps({"translations": [], "error": f"API error: {response.status_code}"}),
-                        is_cached=False
+                        result=cached_result,
+                        is_cached=True
                     )
-            except Exception as e:
                 return PonsResponse(
                     word=word,
-                    result=json.dumps({"translations": [], "error": str(e)}),
+                    result=json.dumps({"translations": [], "error": "API quota reached, no cached result available"}),
                     is_cached=False
                 )
+            else:
+                return PonsResponse(
+                    word=word,
+                    result=json.dumps({"translations": [], "error": f"API error: {response.status_code}"}),
+                    is_cached=False
+                )
+        except Exception as e:
+            return PonsResponse(
+                word=word,
+                result=json.dumps({"translations": [], "error": str(e)}),
+                is_cached=False
+            )
 
-    async def _get_from_cache(self, word: str) -> Optional[PonsCache]:
-        """Get word definition from cache and update access statistics."""
+    async def _get_from_cache(self, word: str) -> Optional[str]:
+        """
+        Get the serialized result from cache and record the access for the next
+        stats flush. Entries past PONS_CACHE_TTL are still returned, and a
+        background refresh replaces them.
+        """
+        key = normalize_word(word)
         async with get_session() as session:
-            statement = select(PonsCache).where(PonsCache.word == word)
+            statement = select(PonsCache).where(PonsCache.word == key)
             result = await session.execute(statement)
             cached_result = result.scalar_one_or_none()
             
             if cached_result:
-                # Update access statistics
-                cached_result.search_count += 1
-                cached_result.last_accessed = datetime.utcnow()
-                session.add(cached_result)
-                await session.commit()
-                return cached_result
+                serialized = self._read_result(cached_result)
+                if cached_result.schema_version < PONS_CACHE_SCHEMA_VERSION:
+                    # Lazily migrate rows written by older versions
+                    self._write_result(cached_result, serialized)
+                    session.add(cached_result)
+                    await session.commit()
+                # Access statistics are written back in batches, keeping hits read-only
+                access_stats.record(PonsCache, key)
+                suggest_index.touch(word)
+                if datetime.utcnow() - cached_result.created_at > timedelta(seconds=PONS_CACHE_TTL):
+                    self.stale_served += 1
+                    self._schedule_refresh(word)
+                return serialized
             return None
 
+    def _schedule_refresh(self, word: str) -> None:
+        key = normalize_word(word)
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+        # fetch_definition only overwrites the row on success, so a failed refresh keeps the stale entry
+        task = asyncio.ensure_future(self.fetch_definition(word))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
     async def _save_to_cache(self, word: str, result: str) -> None:
-        """Save word definition to cache."""
+        """Save word definition to cache, replacing an older entry for the word."""
+        key = normalize_word(word)
+        try:
+            async with get_session() as session:
+                statement = select(PonsCache).where(PonsCache.word == key)
+                existing = await session.execute(statement)
+                cache_entry = existing.scalar_one_or_none()
+
+                now = datetime.utcnow()
+                if cache_entry is None:
+                    cache_entry = PonsCache(word=key, last_accessed=now)
+                cache_entry.display_word = cache_entry.display_word or word.strip()
+                cache_entry.created_at = now
+                self._write_result(cache_entry, result)
+                session.add(cache_entry)
+                await session.commit()
+            suggest_index.touch(word)
+        except IntegrityError:
+            # Another worker cached the same word first
+            pass
+
+    async def migrate_cache(self, batch_size: int = 500) -> int:
+        """Convert all cached rows written by older versions, in batches. Returns the number migrated."""
+        migrated = 0
+        while True:
+            async with get_session() as session:
+                statement = (select(PonsCache)
+                             .where(PonsCache.schema_version < PONS_CACHE_SCHEMA_VERSION)
+                             .limit(batch_size))
+                result = await session.execute(statement)
+                outdated = result.scalars().all()
+                for cache_entry in outdated:
+                    self._write_result(cache_entry, self._read_result(cache_entry))
+                    session.add(cache_entry)
+                await session.commit()
+            migrated += len(outdated)
+            if len(outdated) < batch_size:
+                return migrated
+
+    async def cache_size(self) -> int:
+        """Bytes held by cached results."""
         async with get_session() as session:
-            cache_entry = PonsCache(
-                word=word,
-                result=result,
-                created_at=datetime.utcnow(),
-                last_accessed=datetime.utcnow()
+            result = await session.execute(
+                select(func.coalesce(func.sum(func.length(PonsCache.body) + func.length(PonsCache.result)), 0))
             )
-            session.add(cache_entry)
-            await session.commit() 
\ No newline at end of file
+            return result.scalar_one()
+
+    async def compact_cache(self, max_bytes: int = PONS_CACHE_MAX_BYTES) -> int:
+        """
+        Evict the lowest-scoring rows until the cache fits in 90% of max_bytes.
+        The score is search_count decayed by time since last access, so rows
+        that are both rarely and not recently used go first. Returns rows evicted.
+        """
+        size = await self.cache_size()
+        if size <= max_bytes:
+            return 0
+        excess = size - int(max_bytes * 0.9)
+
+        age_days = func.julianday("now") - func.julianday(PonsCache.last_accessed)
+        score = PonsCache.search_count / (1.0 + age_days / PONS_CACHE_DECAY_DAYS)
+        row_size = func.coalesce(func.length(PonsCache.body), 0) + func.length(PonsCache.result)
+        victims: List[int] = []
+        async with get_session() as session:
+            result = await session.stream(select(PonsCache.id, row_size).order_by(score, PonsCache.last_accessed))
+            async for row_id, size in result:
+                victims.append(row_id)
+                excess -= size
+                if excess <= 0:
+                    break
+            await result.close()
+            for start in range(0, len(victims), 500):
+                await session.execute(delete(PonsCache).where(PonsCache.id.in_(victims[start:start + 500])))
+            await session.commit()
+        # Deleting rows only marks pages free; give them back so the file shrinks too
+        await incremental_vacuum()
+
+        self.evicted += len(victims)
+        print(f"Evicted {len(victims)} PONS cache entries to stay under {max_bytes} bytes")
+        return len(victims)
+
+    async def _run_compaction(self) -> None:
+        while True:
+            try:
+                await self.compact_cache()
+            except Exception as e:
+                print(f"Error compacting PONS cache: {e}")
+            await asyncio.sleep(PONS_CACHE_COMPACT_INTERVAL)
+
+    def start_compaction(self) -> None:
+        if PONS_CACHE_COMPACT_INTERVAL > 0 and self._compaction_task is None:
+            self._compaction_task = asyncio.ensure_future(self._run_compaction())
+
+    async def stop(self) -> None:
+        """Stop compaction and cancel refreshes still in flight."""
+        await self.stop_compaction()
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stop_compaction(self) -> None:
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+            self._compaction_task = None
+
+    async def stats(self) -> Dict[str, Any]:
+        async with get_session() as session:
+            entries = (await session.execute(select(func.count(PonsCache.id)))).scalar_one()
+        return {
+            "entries": entries,
+            "bytes": await self.cache_size(),
+            "file_bytes": await database_file_size(),
+            "max_bytes": PONS_CACHE_MAX_BYTES,
+            "ttl_seconds": PONS_CACHE_TTL,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "refreshing": len(self._refreshing),
+            "evicted": self.evicted
+        }
@@ -0,0 +1,226 @@
+import os
+import json
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlmodel import select
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from starlette.concurrency import run_in_threadpool
+from app.models import QuizProgress, QuizStats
+from app.database import get_session
+
+DEFAULT_QUIZ = "sentences"
+ROLLING_WINDOWS = (7, 30)
+
+def get_progress_file_path() -> str:
+    # Use environment variable for Docker volume path, fallback to local path
+    base_path = os.getenv('QUIZ_DATA_PATH', os.path.join(os.path.dirname(__file__), '..', 'data'))
+    return os.path.join(base_path, 'quiz_progress.json')
+
+def _read_progress_file(path: str) -> Optional[Dict[str, Dict[str, int]]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return {}
+
+def _day_after(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+def _accuracy(correct: int, total: int) -> float:
+    return round(correct / total, 4) if total else 0.0
+
+def _streaks(played_days: List[str]) -> Dict[str, object]:
+    """Current (ending on the last played day) and longest run of consecutive days."""
+    current = longest = 0
+    previous = None
+    for day in played_days:
+        current = current + 1 if previous and _day_after(previous) == day else 1
+        longest = max(longest, current)
+        previous = day
+    return {"current_streak": current, "longest_streak": longest, "last_played": previous}
+
+class ProgressStore:
+    """
+    Daily quiz results in SQLite, one row per (quiz, date) written with an
+    atomic upsert, plus a quiz_stats row per quiz kept up to date on each write.
+    """
+
+    def __init__(self):
+        # Serializes read-update-write of the quiz_stats row within this process
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def upsert(self, day: str, correct: int, total: int, quiz: str = DEFAULT_QUIZ) -> None:
+        """
+        Set the result for one date and fold the change into the quiz's
+        aggregates. Writes for today or a new day are O(1); back-filling an
+        older day or clearing a day re-derives the streaks from history.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        now = datetime.utcnow()
+        async with self._lock, get_session() as session:
+            result = await session.execute(
+                select(QuizProgress).where(QuizProgress.quiz == quiz, QuizProgress.date == day)
+            )
+            previous = result.scalar_one_or_none()
+            old_correct, old_total = (previous.correct, previous.total) if previous else (0, 0)
+
+            statement = insert(QuizProgress).values(quiz=quiz, date=day, correct=correct, total=total, updated_at=now)
+            statement = statement.on_conflict_do_update(
+                index_elements=[QuizProgress.quiz, QuizProgress.date],
+                set_={"correct": correct, "total": total, "updated_at": now}
+            )
+            await session.execute(statement)
+
+            stats = await session.get(QuizStats, quiz) or QuizStats(quiz=quiz)
+            stats.total_correct += correct - old_correct
+            stats.total_answered += total - old_total
+            was_played, is_played = old_total > 0, total > 0
+            if is_played and not was_played:
+                stats.days_played += 1
+                if stats.last_played is None or day > stats.last_played:
+                    # Extends the streak if it is the day after the last one, else starts a new one
+                    if stats.last_played and _day_after(stats.last_played) == day:
+                        stats.current_streak += 1
+                    else:
+                        stats.current_streak = 1
+                    stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+                    stats.last_played = day
+                else:
+                    await self._recompute_streaks(session, stats)
+            elif was_played and not is_played:
+                stats.days_played -= 1
+                await self._recompute_streaks(session, stats)
+            stats.updated_at = now
+            session.add(stats)
+
+    async def _recompute_streaks(self, session, stats: QuizStats) -> None:
+        result = await session.execute(
+            select(QuizProgress.date)
+            .where(QuizProgress.quiz == stats.quiz, QuizProgress.total > 0)
+            .order_by(QuizProgress.date)
+        )
+        for field, value in _streaks(list(result.scalars())).items():
+            setattr(stats, field, value)
+
+    async def rebuild_stats(self) -> int:
+        """Recompute every quiz's aggregates from history. Returns the number of quizzes."""
+        async with get_session() as session:
+            result = await session.execute(select(QuizProgress).order_by(QuizProgress.date))
+            by_quiz: Dict[str, List[QuizProgress]] = {}
+            for row in result.scalars():
+                by_quiz.setdefault(row.quiz, []).append(row)
+
+            for quiz, rows in by_quiz.items():
+                stats = await session.get(QuizStats, quiz) or QuizStats(quiz=quiz)
+                stats.days_played = sum(1 for row in rows if row.total > 0)
+                stats.total_correct = sum(row.correct for row in rows)
+                stats.total_answered = sum(row.total for row in rows)
+                for field, value in _streaks([row.date for row in rows if row.total > 0]).items():
+                    setattr(stats, field, value)
+                stats.updated_at = datetime.utcnow()
+                session.add(stats)
+        return len(by_quiz)
+
+    async def ensure_stats(self) -> None:
+        """Build the aggregates if progress exists but quiz_stats is empty (e.g. first run after upgrade)."""
+        async with get_session() as session:
+            has_stats = (await session.execute(select(QuizStats.quiz).limit(1))).first()
+            has_progress = (await session.execute(select(QuizProgress.id).limit(1))).first()
+        if has_progress and not has_stats:
+            await self.rebuild_stats()
+
+    async def get_stats(self, quiz: Optional[str] = None, today: Optional[str] = None) -> Dict[str, Dict[str, object]]:
+        """
+        Return the aggregates per quiz (or for one quiz). Rolling accuracy
+        reads at most 30 rows per quiz through the (quiz, date) index.
+        """
+        today = today or datetime.utcnow().date().isoformat()
+        yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+
+        async with get_session() as session:
+            statement = select(QuizStats)
+            if quiz:
+                statement = statement.where(QuizStats.quiz == quiz)
+            all_stats = (await session.execute(statement)).scalars().all()
+
+            summary = {}
+            for stats in all_stats:
+                rolling = {}
+                for days in ROLLING_WINDOWS:
+                    start = (date.fromisoformat(today) - timedelta(days=days - 1)).isoformat()
+                    window = await session.execute(
+                        select(func.coalesce(func.sum(QuizProgress.correct), 0),
+                               func.coalesce(func.sum(QuizProgress.total), 0))
+                        .where(QuizProgress.quiz == stats.quiz,
+                               QuizProgress.date >= start, QuizProgress.date <= today)
+                    )
+                    correct, total = window.one()
+                    rolling[f"{days}d"] = {"correct": correct, "total": total, "accuracy": _accuracy(correct, total)}
+
+                # A streak is only current while the last played day is today or yesterday
+                current = stats.current_streak if stats.last_played in (today, yesterday) else 0
+                summary[stats.quiz] = {
+                    "days_played": stats.days_played,
+                    "total_correct": stats.total_correct,
+                    "total_answered": stats.total_answered,
+                    "accuracy": _accuracy(stats.total_correct, stats.total_answered),
+                    "current_streak": current,
+                    "longest_streak": stats.longest_streak,
+                    "last_played": stats.last_played,
+                    "rolling": rolling
+                }
+        return summary
+
+    async def get_range(self, start: Optional[str] = None, end: Optional[str] = None,
+                        limit: Optional[int] = None, quiz: str = DEFAULT_QUIZ) -> Dict[str, Dict[str, int]]:
+        """
+        Return {date: {"correct", "total"}} for dates in [start, end], oldest first.
+        With a limit, only the most recent `limit` dates in the range are returned.
+        """
+        statement = select(QuizProgress).where(QuizProgress.quiz == quiz)
+        if start:
+            statement = statement.where(QuizProgress.date >= start)
+        if end:
+            statement = statement.where(QuizProgress.date <= end)
+        statement = statement.order_by(QuizProgress.date.desc())
+        if limit:
+            statement = statement.limit(limit)
+
+        async with get_session() as session:
+            result = await session.execute(statement)
+            rows = result.scalars().all()
+        return {row.date: {"correct": row.correct, "total": row.total} for row in reversed(rows)}
+
+    async def migrate_json(self, path: Optional[str] = None) -> int:
+        """
+        Import the old quiz_progress.json once, then rename it to *.migrated so
+        it is not imported again. Rows already in the table win over the file.
+        """
+        path = path or get_progress_file_path()
+        progress = await run_in_threadpool(_read_progress_file, path)
+        if progress is None:
+            return 0
+
+        async with get_session() as session:
+            result = await session.execute(select(QuizProgress.date).where(QuizProgress.quiz == DEFAULT_QUIZ))
+            existing = set(result.scalars())
+            imported = 0
+            for day, entry in progress.items():
+                if day in existing or not isinstance(entry, dict):
+                    continue
+                session.add(QuizProgress(quiz=DEFAULT_QUIZ, date=day,
+                                         correct=int(entry.get('correct', 0)), total=int(entry.get('total', 0))))
+                imported += 1
+            await session.commit()
+
+        await run_in_threadpool(os.replace, path, path + ".migrated")
+        if imported:
+            await self.rebuild_stats()
+        return imported
+
+progress_store = ProgressStore()
@@ -0,0 +1,90 @@
+import os
+import json
+import base64
+import secrets
+from typing import Dict, List, Optional
+
+QUIZ_PAGE_SIZE = int(os.getenv("QUIZ_PAGE_SIZE", "10"))
+QUIZ_MAX_PAGE_SIZE = 100
+
+class SeededPermutation:
+    """
+    A shuffle of range(n) determined by a seed, evaluated one position at a time.
+
+    Uses a small Feistel network over the next power-of-two domain with cycle
+    walking, so reading k items costs O(k) no matter how large n is, and the
+    permutation never has to be stored.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, n: int, seed: int):
+        self.n = n
+        half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._mask = (1 << half_bits) - 1
+        self._keys = [(seed * 0x9E3779B97F4A7C15 + (r + 1) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+                      for r in range(self.ROUNDS)]
+
+    def _round(self, value: int, key: int) -> int:
+        value = (value ^ key) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+        value ^= value >> 29
+        return value & self._mask
+
+    def _encrypt(self, x: int) -> int:
+        left, right = x >> self._half_bits, x & self._mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.n:
+            raise IndexError(index)
+        value = self._encrypt(index)
+        # Cycle-walk until the value lands inside range(n)
+        while value >= self.n:
+            value = self._encrypt(value)
+        return value
+
+def encode_cursor(seed: int, offset: int, total: int) -> str:
+    raw = json.dumps({"s": seed, "o": offset, "n": total}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+        return {"seed": int(state["s"]), "offset": int(state["o"]), "total": int(state["n"])}
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def read_page(items: List, cursor: Optional[str] = None, page_size: int = QUIZ_PAGE_SIZE) -> Dict[str, object]:
+    """
+    Return the next page of a per-session shuffle of `items`.
+
+    Without a cursor a new session (random seed) starts. The returned
+    next_cursor continues the same order; once every item has been served a
+    fresh shuffle begins. If the dataset size changed since the cursor was
+    issued (e.g. a vocabulary reload) the session restarts on the new data.
+    """
+    total = len(items)
+    page_size = max(1, min(page_size, QUIZ_MAX_PAGE_SIZE))
+    if cursor:
+        state = decode_cursor(cursor)
+        seed, offset = state["seed"], state["offset"]
+        if state["total"] != total or not 0 <= offset < max(total, 1):
+            seed, offset = secrets.randbits(32), 0
+    else:
+        seed, offset = secrets.randbits(32), 0
+
+    if total == 0:
+        return {"items": [], "next_cursor": None, "total": 0}
+
+    permutation = SeededPermutation(total, seed)
+    end = min(offset + page_size, total)
+    page = [items[permutation[i]] for i in range(offset, end)]
+
+    if end >= total:
+        # Everything served: continue with a new shuffle
+        seed, end = secrets.randbits(32), 0
+    return {"items": page, "next_cursor": encode_cursor(seed, end, total), "total": total}
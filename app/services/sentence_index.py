@@ -0,0 +1,113 @@
+import re
+import html
+import shlex
+from typing import Dict, List, Iterable, Optional, Set, Tuple
+from app.services.normalize import normalize_word
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def tokenize(text: str) -> List[str]:
+    """Split into word tokens folded the same way as cache keys (case, umlauts, ß)."""
+    return [normalize_word(token) for token in TOKEN_PATTERN.findall(text)]
+
+def strip_tags(text: str) -> str:
+    return html.unescape(TAG_PATTERN.sub("", text)).strip()
+
+class SentenceIndex:
+    """Positional inverted index over example sentences, searched field by field."""
+
+    FIELDS = ("german", "german_2", "english")
+
+    def __init__(self):
+        self._documents: List[Dict[str, str]] = []
+        # token -> {(doc_id, field): [positions]}
+        self._postings: Dict[str, Dict[Tuple[int, str], List[int]]] = {}
+        self._seen: Set[str] = set()
+
+    def add(self, source: str, german: str, german_2: str = "", english: str = "") -> Optional[int]:
+        """Index one sentence; returns its id, or None if the same German text is already indexed."""
+        key = normalize_word(german or german_2)
+        if not key or key in self._seen:
+            return None
+        self._seen.add(key)
+
+        doc_id = len(self._documents)
+        document = {"source": source, "german": german, "german_2": german_2, "english": english}
+        self._documents.append(document)
+        for field in self.FIELDS:
+            for position, token in enumerate(tokenize(document[field])):
+                self._postings.setdefault(token, {}).setdefault((doc_id, field), []).append(position)
+        return doc_id
+
+    def add_sheet_sentences(self, sentences: Iterable[Dict[str, str]]) -> None:
+        for sentence in sentences:
+            self.add("sentences", sentence["German"], sentence["German example 2"], sentence["English"])
+
+    def add_examples(self, examples: Iterable[Dict[str, str]]) -> None:
+        """Index verbformen Beispiele ({"de", "en"} with inline markup)."""
+        for example in examples:
+            self.add("verbformen", strip_tags(example.get("de", "")), "", strip_tags(example.get("en", "")))
+
+    def _match_phrase(self, tokens: List[str]) -> Set[int]:
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return set()
+        # Walk the rarest token's occurrences and check the others sit around it
+        pivot = min(range(len(tokens)), key=lambda i: len(postings[i]))
+        matches = set()
+        for unit, positions in postings[pivot].items():
+            if unit[0] in matches or not all(unit in posting for posting in postings):
+                continue
+            for position in positions:
+                start = position - pivot
+                if all(start + offset in postings[offset][unit] for offset in range(len(tokens))):
+                    matches.add(unit[0])
+                    break
+        return matches
+
+    def _match_term(self, token: str) -> Set[int]:
+        return {doc_id for doc_id, _ in self._postings.get(token, {})}
+
+    def search(self, query: str, page: int = 1, page_size: int = 20) -> Dict[str, object]:
+        """
+        AND together every clause of the query. Quoted clauses are phrases that
+        must appear consecutively within one field; bare words may appear anywhere.
+        """
+        try:
+            clauses = shlex.split(query)
+        except ValueError:
+            # Unbalanced quote: treat the whole query as plain terms
+            clauses = query.replace('"', " ").split()
+
+        matches: Optional[Set[int]] = None
+        for clause in clauses:
+            tokens = tokenize(clause)
+            if not tokens:
+                continue
+            if len(tokens) == 1:
+                clause_matches = self._match_term(tokens[0])
+            else:
+                clause_matches = self._match_phrase(tokens)
+            matches = clause_matches if matches is None else matches & clause_matches
+            if not matches:
+                break
+
+        ordered = sorted(matches or ())
+        start = (page - 1) * page_size
+        return {
+            "query": query,
+            "total": len(ordered),
+            "page": page,
+            "page_size": page_size,
+            "results": [self._documents[doc_id] for doc_id in ordered[start:start + page_size]]
+        }
+
+    def swap_from(self, other: "SentenceIndex") -> None:
+        """Take over another index's contents in one step, so readers never see a partial rebuild."""
+        self.__dict__.update(other.__dict__)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+sentence_index = SentenceIndex()
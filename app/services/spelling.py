@@ -0,0 +1,68 @@
+from typing import Dict, Set, List, Tuple
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count as one edit), or max_distance + 1 if larger."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+class SymSpellIndex:
+    """Symmetric-delete spelling index: every word is stored under all its deletions up to max_distance."""
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._deletes: Dict[str, Set[str]] = {}
+        self._words: Set[str] = set()
+
+    def _variants(self, word: str) -> Set[str]:
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            next_frontier = set()
+            for term in frontier:
+                if len(term) <= 1:
+                    continue
+                for i in range(len(term)):
+                    next_frontier.add(term[:i] + term[i + 1:])
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def add(self, word: str) -> None:
+        """Index an already-normalized word."""
+        if not word or word in self._words:
+            return
+        self._words.add(word)
+        for variant in self._variants(word):
+            self._deletes.setdefault(variant, set()).add(word)
+
+    def lookup(self, word: str) -> List[Tuple[str, int]]:
+        """Return (known word, distance) pairs within max_distance of an already-normalized word."""
+        candidates = set()
+        for variant in self._variants(word):
+            candidates |= self._deletes.get(variant, set())
+
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, self.max_distance)
+            if distance <= self.max_distance:
+                matches.append((candidate, distance))
+        return matches
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
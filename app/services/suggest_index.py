@@ -0,0 +1,151 @@
+import heapq
+from bisect import bisect_left, insort
+from typing import Dict, List, Iterable, Tuple
+from sqlmodel import select
+from sqlalchemy import func
+from app.models import PonsCache, VerbformenCache
+from app.database import get_session
+from app.services.normalize import normalize_word
+from app.services.spelling import SymSpellIndex
+
+# Prefixes up to this length match too many words to rank per keystroke, so
+# their best SUGGEST_TOP_N completions are kept ready
+SUGGEST_TOP_PREFIX_LEN = 3
+SUGGEST_TOP_N = 25
+
+class SuggestIndex:
+    """
+    Prefix index over known headwords: a sorted key array searched with bisect,
+    plus precomputed rankings for short prefixes.
+    """
+
+    def __init__(self, top_prefix_len: int = SUGGEST_TOP_PREFIX_LEN, top_n: int = SUGGEST_TOP_N):
+        self._keys: List[str] = []
+        self._display: Dict[str, str] = {}
+        self._counts: Dict[str, int] = {}
+        self.top_prefix_len = top_prefix_len
+        self.top_n = top_n
+        # short prefix -> its top_n keys, best first
+        self._top: Dict[str, List[str]] = {}
+        # Deletion-neighbourhood index over the same keys for "did you mean"
+        self.spelling = SymSpellIndex(max_distance=2)
+
+    @staticmethod
+    def _key(word: str) -> str:
+        return normalize_word(word)
+
+    def _rank(self, key: str) -> Tuple[int, int, str]:
+        # Most searched first, shorter words breaking ties
+        return (-self._counts[key], len(key), key)
+
+    def _update_top(self, key: str) -> None:
+        """Re-rank key in the lists of its short prefixes. Counts only grow, so keys only move up."""
+        for length in range(1, min(len(key), self.top_prefix_len) + 1):
+            top = self._top.setdefault(key[:length], [])
+            if key not in top:
+                if len(top) >= self.top_n and self._rank(key) >= self._rank(top[-1]):
+                    continue
+                top.append(key)
+            top.sort(key=self._rank)
+            del top[self.top_n:]
+
+    def _build_top(self) -> None:
+        groups: Dict[str, List[str]] = {}
+        for key in self._keys:
+            for length in range(1, min(len(key), self.top_prefix_len) + 1):
+                groups.setdefault(key[:length], []).append(key)
+        self._top = {
+            prefix: heapq.nsmallest(self.top_n, keys, key=self._rank)
+            for prefix, keys in groups.items()
+        }
+
+    def _update_display(self, key: str, word: str) -> None:
+        # Rows cached before display words were stored only know the key (maedchen); any real spelling beats it
+        word = word.strip()
+        if self._display[key] == key and word != key:
+            self._display[key] = word
+
+    def add(self, word: str, count: int = 0) -> None:
+        """Insert a word in sorted position, or add to its count if it is already known."""
+        key = self._key(word)
+        if not key:
+            return
+        if key in self._counts:
+            self._counts[key] += count
+            self._update_display(key, word)
+        else:
+            insort(self._keys, key)
+            self._display[key] = word.strip()
+            self._counts[key] = count
+            self.spelling.add(key)
+        self._update_top(key)
+
+    def touch(self, word: str) -> None:
+        """Count one more search for a word, adding it if it is new."""
+        self.add(word, 1)
+
+    def bulk_load(self, entries: Iterable[Tuple[str, int]]) -> None:
+        """Load many (word, count) pairs and sort once."""
+        for word, count in entries:
+            key = self._key(word)
+            if not key:
+                continue
+            if key in self._counts:
+                self._counts[key] += count
+                self._update_display(key, word)
+            else:
+                self._display[key] = word.strip()
+                self._counts[key] = count
+                self.spelling.add(key)
+        self._keys = sorted(self._counts)
+        self._build_top()
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, object]]:
+        """Return up to `limit` completions, most searched first, shorter words breaking ties."""
+        key = self._key(prefix)
+        if not key:
+            return []
+        if len(key) <= self.top_prefix_len and limit <= self.top_n:
+            best = self._top.get(key, [])[:limit]
+        else:
+            # Longer prefixes narrow the range enough to rank it on the fly
+            start = bisect_left(self._keys, key)
+            end = bisect_left(self._keys, key + "\uffff", start)
+            best = heapq.nsmallest(limit, self._keys[start:end], key=self._rank)
+        return [{"word": self._display[k], "count": self._counts[k]} for k in best]
+
+    def did_you_mean(self, word: str, limit: int = 5) -> List[Dict[str, object]]:
+        """Known words within two edits of `word`, closest and most searched first."""
+        key = self._key(word)
+        if not key:
+            return []
+        matches = sorted(
+            self.spelling.lookup(key),
+            key=lambda match: (match[1], -self._counts[match[0]], match[0])
+        )
+        return [
+            {"word": self._display[k], "distance": distance, "count": self._counts[k]}
+            for k, distance in matches[:limit]
+        ]
+
+    def __contains__(self, word: str) -> bool:
+        return self._key(word) in self._counts
+
+    def swap_from(self, other: "SuggestIndex") -> None:
+        """Take over another index's contents in one step, so readers never see a partial rebuild."""
+        self.__dict__.update(other.__dict__)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+async def load_cached_words() -> List[Tuple[str, int]]:
+    """Read (word as searched, search_count) from both lookup caches."""
+    entries = []
+    async with get_session() as session:
+        for model in (PonsCache, VerbformenCache):
+            word = func.coalesce(model.display_word, model.word)
+            result = await session.execute(select(word, model.search_count))
+            entries.extend(result.all())
+    return entries
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,227 @@
+import re
+from typing import Any, Dict, Iterator, List, Optional
+from app.services.verbformen_parser import parse_page
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    # lxml is optional; without it every page goes through the BeautifulSoup parser
+    lxml_html = None
+
+IMAGE_PATTERN = re.compile(r'https://www\.verbformen\.de/deklination/substantive/[^"]+\.png')
+SOUND_PATTERN = re.compile(r'https://www\.verbformen\.de/deklination/substantive/grundform/[^"]+\.mp3')
+
+# Tags BeautifulSoup writes as <tag/>, and attributes it treats as space-separated lists
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+    "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+    "image", "isindex", "nextid", "spacer"
+}
+LIST_ATTRIBUTES = {
+    "*": {"class", "accesskey", "dropzone"},
+    "a": {"rel", "rev"}, "link": {"rel", "rev"}, "area": {"rel"},
+    "td": {"headers"}, "th": {"headers"}, "form": {"accept-charset"},
+    "object": {"archive"}, "icon": {"sizes"}, "iframe": {"sandbox"}, "output": {"for"}
+}
+# Their text is not part of get_text() and is written out unescaped
+RAW_TEXT_TAGS = {"script", "style", "template"}
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+ASCII_SPACES = " \n\t\x0c\r"
+CONJUGATION_KEYS = ("präsens", "präteritum", "imperativ", "konjunktiv_i", "konjunktiv_ii", "infinitiv", "partizip")
+
+def _has_class(element, name: str) -> bool:
+    return name in (element.get("class") or "").split()
+
+def _collapse(text: str, preserve: bool = False) -> str:
+    """BeautifulSoup stores a whitespace-only string as a single newline or space."""
+    if preserve or not text or text.strip(ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+def _strings(element, preserve: bool = False) -> Iterator[str]:
+    """Text nodes under element, in document order, the way BeautifulSoup's get_text() sees them."""
+    preserve = preserve or element.tag in PRESERVE_WHITESPACE_TAGS
+    if element.text and element.tag not in RAW_TEXT_TAGS:
+        yield _collapse(element.text, preserve)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in RAW_TEXT_TAGS:
+            yield from _strings(child, preserve)
+        if child.tail:
+            yield _collapse(child.tail, preserve)
+
+def _text(element) -> str:
+    """Equivalent of get_text(strip=True)."""
+    return "".join(text.strip() for text in _strings(element))
+
+def _string(element) -> Optional[str]:
+    """Equivalent of Tag.string: the text of an element whose only content is one string."""
+    children = list(element)
+    if element.text:
+        return None if children else element.text
+    if len(children) != 1 or children[0].tail:
+        return None
+    child = children[0]
+    if not isinstance(child.tag, str):
+        return child.text
+    return _string(child)
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def _quote(value: str) -> str:
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', "&quot;") + '"'
+
+def _serialize(element, preserve: bool = False) -> str:
+    """
+    Markup for element without its tail, identical to str() of the BeautifulSoup
+    tag. The one exception is a valueless boolean attribute such as `disabled`,
+    which libxml2 reports as disabled="disabled" where html.parser has "".
+    """
+    if not isinstance(element.tag, str):
+        return f"<!--{_collapse(element.text or '', preserve)}-->"
+    tag = element.tag
+    preserve = preserve or tag in PRESERVE_WHITESPACE_TAGS
+    list_attributes = LIST_ATTRIBUTES["*"] | LIST_ATTRIBUTES.get(tag, set())
+    parts = ["<", tag]
+    # BeautifulSoup's default formatter writes attributes sorted by name
+    for name, value in sorted(element.attrib.items()):
+        if name in list_attributes:
+            value = " ".join(value.split())
+        parts.append(f" {name}={_quote(_escape(value))}")
+    if tag in VOID_TAGS:
+        parts.append("/>")
+        return "".join(parts)
+    parts.append(">")
+    raw = tag in RAW_TEXT_TAGS
+    if element.text:
+        text = _collapse(element.text, preserve)
+        parts.append(text if raw else _escape(text))
+    for child in element:
+        parts.append(_serialize(child, preserve))
+        if child.tail:
+            tail = _collapse(child.tail, preserve)
+            parts.append(tail if raw else _escape(tail))
+    parts.append(f"</{tag}>")
+    return "".join(parts)
+
+def _example(li) -> Dict[str, str]:
+    # German text: the item's markup up to the first direct <br>
+    german_html = _collapse(li.text or "")
+    for child in li:
+        if child.tag == "br":
+            break
+        if isinstance(child.tag, str):
+            german_html += _serialize(child)
+        else:
+            # A comment is added as its bare text, like any other string child
+            german_html += _collapse(child.text or "")
+        german_html += _collapse(child.tail or "")
+
+    english_translation = ""
+    br = next(li.iterdescendants("br"), None)
+    if br is not None and (br.tail or br.getnext() is not None):
+        following_span = next(iter(br.xpath("following::span[1]")), None)
+        if following_span is not None:
+            english_translation = _text(following_span)
+    return {"de": german_html.strip(), "en": english_translation}
+
+def _conjugations(root) -> Dict[str, List[str]]:
+    """Rows of the Präsens, Präteritum and Partizip tables, keyed like the payload."""
+    verb_conjugations = {}
+    for table_div in root.iter("div"):
+        if not _has_class(table_div, "vTbl"):
+            continue
+        heading = next((h2 for h2 in table_div.iterdescendants("h2") if _has_class(h2, "wG")), None)
+        if heading is None:
+            continue
+        tense = _text(heading).lower()
+        if "präsens" in tense:
+            tense_key = "präsens"
+        elif "präteritum" in tense:
+            tense_key = "präteritum"
+        elif "partizip" in tense:
+            tense_key = "partizip"
+        else:
+            continue
+        table = next(table_div.iterdescendants("table"), None)
+        if table is None:
+            continue
+        conjugations = []
+        for row in table.iterdescendants("tr"):
+            cells = list(row.iterdescendants("td"))
+            if len(cells) >= 2:
+                conjugations.append(f"{_text(cells[0])} {_text(cells[1])}")
+            elif len(cells) == 1:
+                conjugations.append(_text(cells[0]))
+        if conjugations:
+            verb_conjugations[tense_key] = conjugations
+    return verb_conjugations
+
+def extract_page(html: str, encoded_word: str) -> Dict[str, Any]:
+    """
+    Meant to give the same result as verbformen_parser.parse_page, many times
+    faster: the page is parsed by libxml2 and only the handful of elements the
+    payload needs are visited. benchmark_parser checks the two agree.
+
+    libxml2 repairs illegal nesting (a <p> inside a <p>) that html.parser
+    keeps, so such markup can still come out differently. Falls back to
+    parse_page when lxml is missing or rejects the input.
+    """
+    if lxml_html is None or not html.strip():
+        return parse_page(html, encoded_word)
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (ValueError, etree.ParserError):
+        return parse_page(html, encoded_word)
+
+    article = ""
+    nominativ = next((th for th in root.iter("th") if th.get("title") == "Nominativ"), None)
+    if nominativ is not None:
+        parent_row = next(nominativ.iterancestors("tr"), None)
+        if parent_row is not None:
+            cells = list(parent_row.iterdescendants("td"))
+            if len(cells) >= 2:
+                article = _text(cells[0])
+
+    translation_text = ""
+    beispiele_list = []
+    verb_conjugations = {key: [] for key in CONJUGATION_KEYS}
+    translation_span = next((span for span in root.iter("span") if span.get("lang") == "en"), None)
+    if translation_span is not None:
+        translation_text = ", ".join(_strings(translation_span)).strip()
+        translation_text = ", ".join(filter(None, translation_text.split(", ")))
+        verb_conjugations.update(_conjugations(root))
+
+        heading = next((h2 for h2 in root.iter("h2") if _string(h2) == "Beispiele"), None)
+        if heading is not None:
+            beispiele_section = next(iter(heading.xpath("(descendant::ul | following::ul)[1]")), None)
+            if beispiele_section is not None:
+                beispiele_list = [_example(li) for li in beispiele_section.iterdescendants("li")]
+
+    match = IMAGE_PATTERN.search(html)
+    sound_match = SOUND_PATTERN.search(html)
+    return {
+        "image_url": match.group(0) if match else f"https://www.verbformen.de/deklination/substantive/{encoded_word}.png",
+        "translation": translation_text,
+        "beispiele_list": beispiele_list,
+        "article": article,
+        "word_sound": sound_match.group(0) if sound_match else None,
+        "verb_conjugations": verb_conjugations
+    }
+
+def verify_page(html: str, encoded_word: str) -> Dict[str, Any]:
+    """
+    Return parse_page's result, reporting any page extract_page disagrees on.
+    Runs both parsers, so it is for checking the extractor on live traffic
+    before switching to it, not for speed.
+    """
+    page = parse_page(html, encoded_word)
+    if extract_page(html, encoded_word) != page:
+        print(f"lxml extractor disagrees with BeautifulSoup on {encoded_word}; "
+              f"save the page with `benchmark_parser --capture` to investigate")
+    return page
@@ -0,0 +1,128 @@
+import re
+from typing import Any, Dict
+from bs4 import BeautifulSoup
+
+def parse_page(html: str, encoded_word: str) -> Dict[str, Any]:
+    """
+    Extract the lookup fields from a verbformen.de page. Pure CPU work with no
+    I/O, so it can run in a worker process; image_url is only a candidate
+    that the caller still has to verify.
+    """
+    # Parse HTML with BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract grammatical article from Nominativ row
+    article = ""
+    nominativ_row = soup.find("th", title="Nominativ")
+    if nominativ_row:
+        parent_row = nominativ_row.find_parent("tr")
+        if parent_row:
+            cells = parent_row.find_all("td")
+            if len(cells) >= 2:
+                article = cells[0].get_text(strip=True)
+
+    # Find the span with lang="en" tag containing the translation
+    translation_span = soup.find('span', lang='en')
+
+    translation_text = ""
+    beispiele_list = []
+    verb_conjugations = {
+        "präsens": [],
+        "präteritum": [],
+        "imperativ": [],
+        "konjunktiv_i": [],
+        "konjunktiv_ii": [],
+        "infinitiv": [],
+        "partizip": []
+    }
+
+    if translation_span:
+        # Extract the text, removing any HTML tags within the span
+        translation_text = translation_span.get_text(separator=", ")
+        translation_text = translation_text.strip()
+        translation_text = ", ".join(filter(None, translation_text.split(", ")))
+
+        # Find verb conjugations from tables
+        conjugation_tables = soup.find_all("div", class_="vTbl")
+        for table_div in conjugation_tables:
+            heading = table_div.find("h2", class_="wG")
+            if heading:
+                tense = heading.get_text(strip=True).lower()
+                # Map the tense to our standardized keys
+                tense_key = None
+                if "präsens" in tense:
+                    tense_key = "präsens"
+                elif "präteritum" in tense:
+                    tense_key = "präteritum"
+                elif "partizip" in tense:
+                    tense_key = "partizip"
+
+                if tense_key:
+                    # Get the table
+                    table = table_div.find("table")
+                    if table:
+                        conjugations = []
+                        rows = table.find_all("tr")
+                        for row in rows:
+                            cells = row.find_all("td")
+                            if len(cells) >= 2:
+                                pronoun = cells[0].get_text(strip=True)
+                                verb = cells[1].get_text(strip=True)
+                                conjugations.append(f"{pronoun} {verb}")
+                            elif len(cells) == 1:
+                                verb = cells[0].get_text(strip=True)
+                                conjugations.append(verb)
+
+                        if conjugations:
+                            verb_conjugations[tense_key] = conjugations
+
+        heading = soup.find("h2", string="Beispiele")
+
+        if heading:
+            beispiele_section = heading.find_next("ul")
+
+            if beispiele_section:
+                list_items = beispiele_section.find_all("li")
+                for li in list_items:
+                    # Extract only the German text before the <br> tag
+                    german_html = ""
+                    for content in li.contents:
+                        if content.name == 'br':
+                            break
+                        if isinstance(content, str):
+                            german_html += content
+                        else:
+                            german_html += str(content)
+                    german_text = german_html.strip()
+
+                    # Extract the English translation from the img title or the span after <br>
+                    translation_span = li.find("br")
+                    english_translation = ""
+                    if translation_span and translation_span.next_sibling:
+                        following_span = translation_span.find_next("span")
+                        if following_span:
+                            english_translation = following_span.get_text(strip=True)
+
+                    beispiele_list.append({
+                        "de": german_text,
+                        "en": english_translation
+                    })
+
+    # Simple image URL logic based on known pattern
+    base_image_url = f"https://www.verbformen.de/deklination/substantive/{encoded_word}.png"
+
+    # Try to find the actual image URL in the HTML using the requested pattern
+    match = re.search(r'https://www\.verbformen\.de/deklination/substantive/[^"]+\.png', html)
+    dynamic_image_url = match.group(0) if match else base_image_url
+
+    # Search for MP3 sound URL - look for any MP3 file containing the word
+    sound_match = re.search(r'https://www\.verbformen\.de/deklination/substantive/grundform/[^"]+\.mp3', html)
+    word_sound = sound_match.group(0) if sound_match else None
+    return {
+        "image_url": dynamic_image_url,
+        "translation": translation_text,
+        "beispiele_list": beispiele_list,
+        "article": article,
+        "word_sound": word_sound,
+        "verb_conjugations": verb_conjugations
+    }
@@ -0,0 +1,101 @@
+import os
+from typing import Dict, Any, Tuple, Optional
+from urllib.parse import quote
+import httpx
+from app.services.http_client import http_request, UpstreamUnavailable
+from app.services.lookup_cache import lookup_cache
+from app.services.media_cache import media_cache
+from app.services.negative_cache import negative_cache
+from app.services.singleflight import singleflight
+from app.services.normalize import normalize_word
+from app.services.sentence_index import sentence_index
+from app.services.parse_pool import parse_pool, PoolSaturated
+from app.services.verbformen_parser import parse_page
+from app.services.verbformen_extractor import extract_page, verify_page
+
+VERBFORMEN_URL = "https://www.verbformen.de/"
+# "bs4" parses with BeautifulSoup, "lxml" with the much faster extractor, and
+# "verify" runs both, serving BeautifulSoup's result and reporting differences.
+# BeautifulSoup stays the default until the extractor is checked on captured pages.
+PAGE_PARSERS = {"bs4": parse_page, "lxml": extract_page, "verify": verify_page}
+VERBFORMEN_PARSER = os.getenv("VERBFORMEN_PARSER", "bs4")
+if VERBFORMEN_PARSER not in PAGE_PARSERS:
+    raise ValueError(f"VERBFORMEN_PARSER must be one of {list(PAGE_PARSERS)}, not {VERBFORMEN_PARSER!r}")
+
+class VerbformenService:
+    async def get_payload(self, word: str, wait_for_parser: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """Return (payload, is_cached), fetching at most once for concurrent callers on a miss."""
+        cached_payload = await self.get_cached_payload(word)
+        if cached_payload:
+            return cached_payload, True
+        return await self.fetch_or_stale(word, wait_for_parser)
+
+    async def fetch_or_stale(self, word: str, wait_for_parser: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """Fetch upstream; if verbformen.de or the parse pool is failing, fall back to an expired cache entry."""
+        try:
+            return media_cache.localize(await self.fetch_and_cache(word, wait_for_parser)), False
+        except (UpstreamUnavailable, PoolSaturated, httpx.HTTPError):
+            stale_payload = await lookup_cache.get_stale(word)
+            if stale_payload is None:
+                raise
+            return media_cache.localize({**stale_payload, "word": quote(word), "stale": True}), True
+
+    async def get_cached_payload(self, word: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload without going upstream."""
+        # Words recently found to have no translation are answered from memory, unless
+        # another spelling with the same normalized key has since been cached
+        cached_payload = await lookup_cache.get(word) or negative_cache.get("verbformen", word)
+        if not cached_payload:
+            return None
+        # The entry may have been stored under another spelling of the same key
+        return media_cache.localize({**cached_payload, "word": quote(word)})
+
+    async def fetch_and_cache(self, word: str, wait_for_parser: bool = True) -> Dict[str, Any]:
+        """
+        Fetch a fresh payload into the cache, coalescing concurrent fetches of the
+        same word. With wait_for_parser=False a busy parse pool raises PoolSaturated.
+        """
+        return await singleflight.do(
+            f"lookup:{normalize_word(word)}",
+            lambda: self._fetch_and_cache(word, wait_for_parser)
+        )
+
+    async def _fetch_and_cache(self, word: str, wait_for_parser: bool) -> Dict[str, Any]:
+        payload = await self.fetch_payload(word, wait_for_parser)
+        if not payload.get("translation"):
+            # Likely a misspelling: remember it briefly instead of caching it for LOOKUP_CACHE_TTL
+            negative_cache.add("verbformen", word, payload)
+            return payload
+        await lookup_cache.set(word, payload)
+        sentence_index.add_examples(payload["beispiele_list"])
+        return payload
+
+    async def fetch_payload(self, word: str, wait_for_parser: bool = True) -> Dict[str, Any]:
+        """Download the verbformen.de page for a word and build the lookup payload."""
+        encoded_word = quote(word)
+        verbformen_url = f"{VERBFORMEN_URL}?w={encoded_word}"
+        response = await http_request("GET", verbformen_url)
+        if response.status_code == 429 or response.status_code >= 500:
+            # Don't parse and cache an error page
+            raise UpstreamUnavailable(f"verbformen.de answered {response.status_code}")
+        html = response.text
+
+        # Parsing is CPU-bound: run it in the worker pool, off the event loop
+        page = await parse_pool.run(PAGE_PARSERS[VERBFORMEN_PARSER], html, encoded_word, wait=wait_for_parser)
+
+        # The payload keeps the upstream media URLs. localize() points responses at the
+        # local copies, or drops files upstream does not have, once the media cache knows
+        # them; until then they are downloaded in the background on their own rate budget.
+        return {
+            "word": encoded_word,
+            "pons": {},
+            "verbformen_html": f'<a href="{verbformen_url}">{verbformen_url}</a>',
+            "verb_image_url": page["image_url"],
+            "translation": page["translation"],
+            "beispiele_list": page["beispiele_list"],
+            "article": page["article"],
+            "word_sound": page["word_sound"],
+            "verb_conjugations": page["verb_conjugations"]
+        }
+
+verbformen_service = VerbformenService()
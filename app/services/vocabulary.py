@@ -0,0 +1,319 @@
+import os
+import json
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from openpyxl import load_workbook
+from starlette.concurrency import run_in_threadpool
+
+VOCAB_PATH = Path("resource/learn_vocab.xlsx")
+# Plain JSON rather than pickle: app/data is a shared volume, and reading it must never run code
+SNAPSHOT_PATH = Path("app/data/vocab_snapshot.json")
+# Bump whenever the parsed shape changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FIELDS = ("nouns", "verbs", "sentences", "quiz_sentences")
+# Seconds between checks of the workbook for changes (0 disables watching)
+VOCAB_WATCH_INTERVAL = float(os.getenv("VOCAB_WATCH_INTERVAL", "5"))
+
+# Cell texts pandas.read_excel treats as missing; kept so parsing matches the old loaders
+MISSING_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+}
+
+class Vocabulary:
+    """Everything parsed from learn_vocab.xlsx, shared by all routers."""
+
+    def __init__(self, nouns: List[Dict], verbs: List[Dict], sentences: List[Dict], quiz_sentences: List[Dict]):
+        self.nouns = nouns
+        # Verb sheet rows and Sentences rows in the shape the verb quiz uses
+        self.verbs = verbs
+        self.sentences = sentences
+        # Sentences with both German and English, for the sentence quiz
+        self.quiz_sentences = quiz_sentences
+
+    def to_dict(self) -> Dict[str, List[Dict]]:
+        return {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Vocabulary":
+        """Rebuild from to_dict() output, raising ValueError unless every field is a list of string dicts."""
+        for field in SNAPSHOT_FIELDS:
+            rows = data.get(field)
+            if not isinstance(rows, list) or not all(
+                isinstance(row, dict) and all(isinstance(value, str) for value in row.values())
+                for row in rows
+            ):
+                raise ValueError(f"Malformed {field} in vocabulary snapshot")
+        return cls(*(data[field] for field in SNAPSHOT_FIELDS))
+
+def _cell(row: Dict[str, object], column: str, default: str = "") -> str:
+    value = row.get(column)
+    if value is None:
+        return default
+    text = str(value)
+    if text in MISSING_VALUES:
+        return default
+    return text.strip()
+
+def _read_sheet(workbook, sheet_name: str, header_row: int = 1) -> List[Dict[str, object]]:
+    """Stream a sheet's rows as dicts keyed by the header row."""
+    if sheet_name not in workbook.sheetnames:
+        print(f"Sheet {sheet_name} not found in {VOCAB_PATH}")
+        return []
+    rows = workbook[sheet_name].iter_rows(min_row=header_row, values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return []
+    columns = [str(name) if name is not None else "" for name in header]
+    return [dict(zip(columns, values)) for values in rows]
+
+def _parse_nouns(rows) -> List[Dict]:
+    nouns = []
+    for index, row in enumerate(rows):
+        noun = {
+            "singular": _cell(row, "Noun (singular)"),
+            "gender": _cell(row, "Gender"),
+            "article": _cell(row, "Article"),
+            "full_word": _cell(row, "Full word"),
+            "plural": _cell(row, "Plural", "N/A"),
+            "meaning": _cell(row, "Meanning  "),
+            "example": _cell(row, "Example", "No example available")
+        }
+        # Skip non-nouns (adjectives, adverbs, etc.)
+        if noun["gender"] == "-" or noun["article"] == "":
+            continue
+        # Only require essential fields
+        required_fields = ["singular", "gender", "article", "full_word", "meaning"]
+        if all(noun[field] for field in required_fields):
+            nouns.append(noun)
+        else:
+            print(f"Skipping noun row {index} due to missing required fields: {noun}")
+    return nouns
+
+def _parse_verbs(rows) -> List[Dict]:
+    verbs = []
+    for row in rows:
+        # Check if PP form is "Verb not found"
+        pp_value = _cell(row, "PP")
+        has_perfect_form = pp_value and pp_value.lower() != "verb not found"
+        verb = {
+            "meaning": _cell(row, "Meaning"),
+            "infinitive": _cell(row, "Infinity"),
+            "perfect": pp_value if has_perfect_form else "",
+            "ich": _cell(row, "ich"),
+            "du": _cell(row, "du"),
+            "er": _cell(row, "er"),
+            "sie": _cell(row, "sie"),
+            "es": _cell(row, "es"),
+            "wir_sie": _cell(row, "wir/Sie"),
+            "ihr": _cell(row, "ihr")
+        }
+        # Only add verbs that have at least a meaning and infinitive form
+        if verb["meaning"] and verb["infinitive"]:
+            verbs.append(verb)
+    return verbs
+
+def _parse_sentences(rows):
+    sentences = []
+    quiz_sentences = []
+    for row in rows:
+        sentence = {
+            "English": _cell(row, "English"),
+            "German": _cell(row, "German"),
+            "German example 2": _cell(row, "German example 2")
+        }
+        # Only add sentences that have at least one German text
+        if sentence["German"] or sentence["German example 2"]:
+            sentences.append(sentence)
+        if sentence["German"] and sentence["English"]:
+            quiz_sentences.append({
+                "german": sentence["German"],
+                "english": sentence["English"]
+            })
+    return sentences, quiz_sentences
+
+def parse_workbook(path: Path = VOCAB_PATH) -> Vocabulary:
+    """Parse the Noun, Verb and Sentences sheets in one read-only pass over the workbook."""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        nouns = _parse_nouns(_read_sheet(workbook, "Noun"))
+        # Verb sheet has a title in row 1 and the header in row 2
+        verbs = _parse_verbs(_read_sheet(workbook, "Verb", header_row=2))
+        sentences, quiz_sentences = _parse_sentences(_read_sheet(workbook, "Sentences"))
+    finally:
+        workbook.close()
+    return Vocabulary(nouns, verbs, sentences, quiz_sentences)
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_snapshot(snapshot_path: Path) -> Optional[Dict]:
+    try:
+        with open(snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") == SNAPSHOT_VERSION:
+            snapshot["vocabulary"] = Vocabulary.from_dict(snapshot["vocabulary"])
+            return snapshot
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Ignoring unreadable vocabulary snapshot: {e}")
+    return None
+
+def _write_snapshot(snapshot_path: Path, snapshot: Dict) -> None:
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, snapshot_path)
+    except OSError as e:
+        print(f"Could not write vocabulary snapshot: {e}")
+
+def load_vocabulary(path: Path = VOCAB_PATH, snapshot_path: Path = SNAPSHOT_PATH, raise_errors: bool = False) -> Vocabulary:
+    """
+    Load the vocabulary from the snapshot if it matches the workbook, otherwise
+    parse the workbook and write a fresh snapshot. The snapshot is matched on
+    mtime and size first, and on the SHA-256 of the file when those changed.
+    """
+    if not path.exists():
+        if raise_errors:
+            # A reload must not swap the current data for an empty vocabulary
+            raise FileNotFoundError(f"Vocabulary file not found at: {path.absolute()}")
+        print(f"Vocabulary file not found at: {path.absolute()}")
+        return Vocabulary([], [], [], [])
+
+    stat = path.stat()
+    snapshot = _read_snapshot(snapshot_path)
+    if snapshot and snapshot["mtime_ns"] == stat.st_mtime_ns and snapshot["size"] == stat.st_size:
+        vocabulary = snapshot["vocabulary"]
+        print(f"Loaded vocabulary snapshot: {len(vocabulary.nouns)} nouns, {len(vocabulary.verbs)} verbs, {len(vocabulary.sentences)} sentences")
+        return vocabulary
+
+    source_hash = _file_hash(path)
+    if snapshot and snapshot["sha256"] == source_hash:
+        # Same content with a new mtime (e.g. copied into a container): just refresh the key
+        vocabulary = snapshot["vocabulary"]
+    else:
+        try:
+            vocabulary = parse_workbook(path)
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error loading vocabulary: {e}")
+            return Vocabulary([], [], [], [])
+        print(f"Parsed {path}: {len(vocabulary.nouns)} nouns, {len(vocabulary.verbs)} verbs, {len(vocabulary.sentences)} sentences")
+
+    _write_snapshot(snapshot_path, {
+        "version": SNAPSHOT_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": source_hash,
+        "vocabulary": vocabulary.to_dict()
+    })
+    return vocabulary
+
+def _source_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class VocabularyStore:
+    """
+    Holds the current Vocabulary and swaps in a new one when the workbook changes.
+
+    Modules that derive data from the vocabulary register a prepare hook with
+    on_reload(). On reload every hook builds its new state from the new
+    vocabulary and returns a commit function. The commits then run back to back
+    with no await in between, so no request ever sees a mix of old and new data.
+    """
+
+    def __init__(self, path: Path = VOCAB_PATH, snapshot_path: Path = SNAPSHOT_PATH):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self._source_key = _source_key(path)
+        self.current = load_vocabulary(path, snapshot_path)
+        self._hooks: List[Callable[[Vocabulary], Awaitable[Callable[[], None]]]] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def on_reload(self, prepare: Callable[[Vocabulary], Awaitable[Callable[[], None]]]) -> None:
+        self._hooks.append(prepare)
+
+    async def reload(self) -> bool:
+        """Rebuild the vocabulary and all derived state, then swap it in. Returns False on failure."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            source_key = _source_key(self.path)
+            try:
+                vocabulary = await run_in_threadpool(load_vocabulary, self.path, self.snapshot_path, True)
+                commits = [await prepare(vocabulary) for prepare in self._hooks]
+            except Exception as e:
+                # Keep serving the old data, e.g. when the workbook is caught mid-save
+                self.last_error = str(e)
+                print(f"Vocabulary reload failed, keeping current data: {e}")
+                return False
+
+            self.current = vocabulary
+            for commit in commits:
+                commit()
+            self._source_key = source_key
+            self.reloads += 1
+            self.last_error = None
+            print(f"Vocabulary reloaded: {len(vocabulary.nouns)} nouns, {len(vocabulary.verbs)} verbs, {len(vocabulary.sentences)} sentences")
+            return True
+
+    async def _watch(self, interval: float) -> None:
+        pending_key = None
+        # A workbook version that failed to load is not retried until it changes again
+        failed_key = None
+        while True:
+            await asyncio.sleep(interval)
+            source_key = _source_key(self.path)
+            if source_key is None or source_key in (self._source_key, failed_key):
+                pending_key = None
+                continue
+            # Wait for the file to stay unchanged for one interval so a save in progress is not read
+            if source_key != pending_key:
+                pending_key = source_key
+                continue
+            pending_key = None
+            failed_key = None if await self.reload() else source_key
+
+    def start_watching(self, interval: float = VOCAB_WATCH_INTERVAL) -> None:
+        if interval > 0 and self._task is None:
+            self._task = asyncio.ensure_future(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "nouns": len(self.current.nouns),
+            "verbs": len(self.current.verbs),
+            "sentences": len(self.current.sentences),
+            "quiz_sentences": len(self.current.quiz_sentences),
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+            "watching": self._task is not None
+        }
+
+# Parsed once per process and shared by every router
+vocabulary_store = VocabularyStore()
@@ -1,6 +1,8 @@
 class NounQuiz {
     constructor() {
         this.nouns = [];
+        this.nounCursor = null;
+        this.fetchingNouns = null;  // Page request in flight, shared by every caller
         this.currentNoun = null;
         this.currentMode = 'article';
         this.answerSubmitted = false;  // Add flag to track if answer is submitted
@@ -33,10 +35,31 @@ class NounQuiz {
     }
 
     async loadNouns() {
+        await this.fetchNounPage();
+        this.loadNextNoun();
+    }
+
+    fetchNounPage() {
+        // One request at a time, so the same cursor is never queued twice
+        if (!this.fetchingNouns) {
+            this.fetchingNouns = this.requestNounPage().finally(() => {
+                this.fetchingNouns = null;
+            });
+        }
+        return this.fetchingNouns;
+    }
+
+    async requestNounPage() {
         try {
-            const response = await fetch('/api/noun-quiz/nouns');
-            this.nouns = await response.json();
-            this.loadNextNoun();
+            // Without a cursor the server starts a new shuffled round, so the quiz restarts after the last page
+            const params = this.nounCursor ? `?cursor=${encodeURIComponent(this.nounCursor)}` : '';
+            const response = await fetch(`/api/noun-quiz/nouns/page${params}`);
+            if (!response.ok) {
+                return;
+            }
+            const page = await response.json();
+            this.nouns.push(...page.items);
+            this.nounCursor = page.next_cursor;
         } catch (error) {
             console.error('Error loading nouns:', error);
         }
@@ -81,10 +104,21 @@ class NounQuiz {
         this.loadNextNoun();
     }
 
-    loadNextNoun() {
-        if (this.nouns.length === 0) return;
+    async loadNextNoun() {
+        if (this.nouns.length === 0) {
+            // Wait for the page in flight, or start a new round
+            await this.fetchNounPage();
+            if (this.nouns.length === 0) {
+                this.showNoNouns();
+                return;
+            }
+        }
 
-        this.currentNoun = this.nouns[Math.floor(Math.random() * this.nouns.length)];
+        // Nouns arrive pre-shuffled from the server; fetch the next page before running out
+        this.currentNoun = this.nouns.shift();
+        if (this.nouns.length < 3) {
+            this.fetchNounPage();
+        }
         console.log('Loaded new noun:', this.currentNoun);
         
         // Reset UI
@@ -101,6 +135,16 @@ class NounQuiz {
         }
     }
 
+    showNoNouns() {
+        this.currentNoun = null;
+        this.nounDisplay.textContent = 'No nouns available';
+        this.meaningDisplay.textContent = '';
+        this.typeMeaningDisplay.textContent = 'No nouns available';
+        this.articleButtons.forEach(btn => {
+            btn.disabled = true;
+        });
+    }
+
     resetArticleMode() {
         this.articleButtons.forEach(btn => {
             btn.classList.remove('correct', 'incorrect');
@@ -127,8 +171,8 @@ class NounQuiz {
     }
 
     checkArticle(selectedArticle) {
-        // If answer is already submitted, ignore clicks
-        if (this.answerSubmitted) {
+        // If answer is already submitted, or there is no noun, ignore clicks
+        if (this.answerSubmitted || !this.currentNoun) {
             return;
         }
 
@@ -167,6 +211,9 @@ class NounQuiz {
     }
 
     checkNoun() {
+        if (!this.currentNoun) {
+            return;
+        }
         const input = this.nounInput.value.trim();
         // Case-insensitive comparison
         const isCorrect = input.toLowerCase() === this.currentNoun.full_word.toLowerCase();
@@ -257,6 +304,9 @@ class NounQuiz {
     }
 
     showHint() {
+        if (!this.currentNoun) {
+            return;
+        }
         const hintBtn = this.currentMode === 'article' ? this.articleHintBtn : this.typeHintBtn;
         if (this.currentMode === 'article') {
             hintBtn.textContent = `Hint: ${this.currentNoun.article}`;
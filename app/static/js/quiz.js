@@ -7,7 +7,9 @@ class GermanQuiz {
         this.correctCount = 0;
         this.totalCount = 0;
         this.currentIndex = 0;
-        this.sentences = [];
+        this.sentences = [];  // Unanswered sentences, current one first
+        this.sentenceCursor = null;
+        this.fetchingSentences = null;  // Page request in flight, shared by every caller
         this.isAnswerChecked = false;  // Track if current answer has been checked
         this.hintCount = 0;  // Track hint clicks
 
@@ -47,11 +49,13 @@ class GermanQuiz {
 
     async fetchSentences() {
         try {
-            const response = await fetch('/api/quiz/sentences');
+            const response = await fetch('/api/quiz/sentences/page');
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            this.sentences = await response.json();
+            const page = await response.json();
+            this.sentences = page.items;
+            this.sentenceCursor = page.next_cursor;
             console.log('Fetched sentences:', this.sentences); // Debug log
             if (this.sentences && this.sentences.length > 0) {
                 this.loadQuestion();
@@ -228,15 +232,50 @@ class GermanQuiz {
         }
     }
 
-    nextQuestion() {
+    async nextQuestion() {
         // If user has made an attempt (selected words), check the answer first
         if (this.selectedWords.length > 0 && !this.isAnswerChecked) {
             this.checkAnswer();
             return;  // Stop here and let user click next again
         }
         
-        this.currentIndex++;
+        // Drop answered sentences, so a long session only holds the pages still to be played
+        this.sentences.splice(0, this.currentIndex + 1);
+        this.currentIndex = 0;
+        if (this.sentences.length === 0) {
+            await this.fetchNextSentencePage();
+        }
         this.loadQuestion();
+
+        // Sentences arrive a page at a time; fetch the next page before running out
+        if (this.sentences.length < 3) {
+            this.fetchNextSentencePage();
+        }
+    }
+
+    fetchNextSentencePage() {
+        // One request at a time, so the same cursor is never queued twice
+        if (!this.fetchingSentences) {
+            this.fetchingSentences = this.requestSentencePage().finally(() => {
+                this.fetchingSentences = null;
+            });
+        }
+        return this.fetchingSentences;
+    }
+
+    async requestSentencePage() {
+        try {
+            // Without a cursor the server starts a new shuffled round
+            const params = this.sentenceCursor ? `?cursor=${encodeURIComponent(this.sentenceCursor)}` : '';
+            const response = await fetch(`/api/quiz/sentences/page${params}`);
+            if (response.ok) {
+                const page = await response.json();
+                this.sentences.push(...page.items);
+                this.sentenceCursor = page.next_cursor;
+            }
+        } catch (error) {
+            console.error('Error fetching sentences:', error);
+        }
     }
 
     handleKeyboard(e) {
@@ -286,12 +325,13 @@ class GermanQuiz {
 
     async loadProgress() {
         try {
-            const response = await fetch('/api/quiz/progress');
+            const today = new Date().toISOString().split('T')[0];
+            // Only today and the most recent day before it are shown
+            const response = await fetch(`/api/quiz/progress?end=${today}&limit=2`);
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             const progress = await response.json();
-            const today = new Date().toISOString().split('T')[0];
             
             // Reset counts
             this.correctCount = 0;
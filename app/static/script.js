@@ -11,7 +11,7 @@ async function lookupWord() {
     `;
 
     if (data.verb_image_url) {
-        resultHTML += `<h4>Image:</h4><img src="${data.verb_image_url}" alt="Hint Image" style="max-width: 600px;">`;
+        resultHTML += `<h4>Image:</h4><img src="${data.verb_image_url}" alt="Hint Image" style="max-width: 600px;" onerror="this.remove()">`;
     }
 
     document.getElementById("result").innerHTML = resultHTML;
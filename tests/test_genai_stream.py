@@ -0,0 +1,46 @@
+import asyncio
+from app.services.genai_service import ExampleParser, GenaiService
+
+def test_examples_arrive_as_objects_complete():
+    parser = ExampleParser()
+    assert parser.feed('[{"de": "Ich gehe", "en": "I ') == []
+    assert parser.feed('go"}, {"de": "Du') == [{"de": "Ich gehe", "en": "I go"}]
+    assert parser.feed(' gehst", "en": "You go"}]') == [{"de": "Du gehst", "en": "You go"}]
+
+def test_braces_and_quotes_inside_strings():
+    parser = ExampleParser()
+    text = '[{"de": "Er sagt \\"{hallo}\\"", "en": "He says \\"{hello}\\""}]'
+    assert parser.feed(text) == [{"de": 'Er sagt "{hallo}"', "en": 'He says "{hello}"'}]
+
+def test_malformed_object_is_skipped():
+    parser = ExampleParser()
+    text = '[{"de": "Eins" "en": "One"}, {"de": "Zwei", "en": "Two"}]'
+    assert parser.feed(text) == [{"de": "Zwei", "en": "Two"}]
+    assert parser.skipped == 1
+
+class HangingCompletions:
+    async def create(self, **kwargs):
+        await asyncio.sleep(3600)
+
+class HangingClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": HangingCompletions()})()
+
+async def no_cached_examples(word):
+    return None
+
+def test_stop_cancels_generations_and_releases_followers():
+    async def scenario():
+        service = GenaiService(client=HangingClient())
+        service.get_cached_examples = no_cached_examples
+        _, examples = await service.stream_examples("gehen")
+        follower = asyncio.ensure_future(examples.__anext__())
+        await asyncio.sleep(0)
+        assert len(service._tasks) == 1
+        await service.stop()
+        assert not service._tasks
+        try:
+            await follower
+        except RuntimeError as e:
+            return str(e)
+    assert "cancelled" in asyncio.run(scenario())
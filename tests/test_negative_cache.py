@@ -0,0 +1,50 @@
+import asyncio
+import json
+from app.services.negative_cache import NegativeCache
+
+EMPTY = json.dumps({"translations": []})
+
+def test_miss_is_replayed_for_the_same_word():
+    cache = NegativeCache()
+    cache.add("pons", "Strasse", EMPTY)
+    assert cache.get("pons", "Strasse") == EMPTY
+
+def test_miss_does_not_cover_other_spellings():
+    cache = NegativeCache()
+    cache.add("pons", "Strasse", EMPTY)
+    assert cache.get("pons", "Straße") is None
+    assert cache.get("pons", "strasse") is None
+
+def test_sources_are_kept_apart():
+    cache = NegativeCache()
+    cache.add("pons", "Strasse", EMPTY)
+    assert cache.get("verbformen", "Strasse") is None
+
+def test_expired_entries_are_dropped():
+    cache = NegativeCache(ttl=0)
+    cache.add("pons", "Strasse", EMPTY)
+    assert cache.get("pons", "Strasse") is None
+    assert cache.stats()["entries"] == 0
+
+def test_oldest_entry_is_evicted_when_full():
+    cache = NegativeCache(maxsize=2)
+    for word in ("eins", "zwei", "drei"):
+        cache.add("pons", word, EMPTY)
+    assert cache.get("pons", "eins") is None
+    assert cache.get("pons", "drei") == EMPTY
+
+def test_cached_result_for_another_spelling_wins_over_a_miss(monkeypatch):
+    from app.services import verbformen_service as module
+    payload = {"translation": "street", "word": "Stra%C3%9Fe"}
+
+    async def cached(word):
+        # Stored under the normalized key after a lookup of "Straße"
+        return payload if module.normalize_word(word) == "strasse" else None
+
+    monkeypatch.setattr(module.lookup_cache, "get", cached)
+    monkeypatch.setattr(module.media_cache, "localize", lambda payload: payload)
+    monkeypatch.setattr(module, "negative_cache", NegativeCache())
+    module.negative_cache.add("verbformen", "Strasse", {"translation": ""})
+
+    result = asyncio.run(module.verbformen_service.get_cached_payload("Strasse"))
+    assert result["translation"] == "street"
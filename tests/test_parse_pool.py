@@ -0,0 +1,28 @@
+import time
+import asyncio
+import pytest
+from app.services.parse_pool import ParsePool, PoolSaturated
+
+def slow_double(x):
+    time.sleep(0.05)
+    return x * 2
+
+def test_full_pool_rejects_unless_asked_to_wait():
+    async def scenario():
+        pool = ParsePool(kind="thread", workers=1, queue=1)
+        try:
+            running = [asyncio.ensure_future(pool.run(slow_double, i)) for i in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(PoolSaturated):
+                await pool.run(slow_double, 2)
+            waited = await pool.run(slow_double, 3, wait=True)
+            return await asyncio.gather(*running), waited, pool.stats()
+        finally:
+            pool.stop()
+
+    results, waited, stats = asyncio.run(scenario())
+    assert results == [0, 2]
+    assert waited == 6
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 3
+    assert stats["pending"] == stats["waiting"] == 0
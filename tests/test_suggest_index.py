@@ -0,0 +1,21 @@
+from app.services.suggest_index import SuggestIndex
+
+def test_display_keeps_the_searched_spelling():
+    index = SuggestIndex()
+    index.bulk_load([("Mädchen", 3), ("maedchen", 2)])
+    assert index.suggest("mä") == [{"word": "Mädchen", "count": 5}]
+
+def test_normalized_key_is_replaced_by_a_real_spelling():
+    index = SuggestIndex()
+    # A cache row stored before display words were kept only knows the key
+    index.bulk_load([("maedchen", 2)])
+    index.touch("Mädchen")
+    assert index.suggest("mae") == [{"word": "Mädchen", "count": 3}]
+    assert index.did_you_mean("Madchen")[0]["word"] == "Mädchen"
+
+def test_short_prefix_ranking_matches_a_scan():
+    index = SuggestIndex(top_n=2)
+    index.bulk_load([("Haus", 1), ("Hund", 5), ("Hand", 3), ("Himmel", 0)])
+    assert [s["word"] for s in index.suggest("h", 2)] == ["Hund", "Hand"]
+    index.add("Himmel", 10)
+    assert [s["word"] for s in index.suggest("h", 2)] == ["Himmel", "Hund"]